@@ -1,24 +1,21 @@
-import os
-from sqlite3 import connect
 from flask import Flask, jsonify
 from config import Config
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_pymongo import PyMongo
-from mongoengine import connect
 from dotenv import load_dotenv
+from app.db import connect_mongoengine, init_pymongo
 
 load_dotenv()
 
 app = Flask(__name__)
 app.config.from_object(Config)
-connect(
-    db=os.getenv("DB_DATABASE"), 
-    host=os.getenv("MONGO_URI")
-)
+# mongoengine dan PyMongo memakai client bersama dari app/db.py
+connect_mongoengine()
 
-mongo = PyMongo(app)
+mongo = PyMongo()
+init_pymongo(mongo, app)
 bcrypt = Bcrypt(app)
 jwt = JWTManager(app)
 CORS(app)
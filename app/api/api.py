@@ -1,17 +1,14 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token
-from pymongo import MongoClient
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
-import os
+from app.db import database
 
 load_dotenv()
 api = Blueprint('api', __name__, url_prefix='/api')
 
-client = MongoClient(os.getenv('MONGO_URI'))
-db = client['capstone']
 
 @api.route('/google-login', methods=['POST'])
 def login_with_google():
@@ -29,7 +26,7 @@ def login_with_google():
         if not email:
             return jsonify({'error': 'Email tidak ditemukan dari token Google'}), 400
 
-        user = db.users.find_one({'email': email})
+        user = database('capstone').users.find_one({'email': email})
 
         if not user:
             user_data = {
@@ -40,8 +37,8 @@ def login_with_google():
                 'is_verified': True,
                 'login_with_google': True
             }
-            inserted = db.users.insert_one(user_data)
-            user = db.users.find_one({'_id': inserted.inserted_id})
+            inserted = database('capstone').users.insert_one(user_data)
+            user = database('capstone').users.find_one({'_id': inserted.inserted_id})
 
         access_token = create_access_token(
             identity=str(user['_id']),
@@ -1,113 +1,304 @@
-from flask import Blueprint, request, jsonify
-import threading, os, cv2, mediapipe as mp
-import numpy as np, pandas as pd, pickle, base64
-from datetime import datetime
+from flask import Blueprint, request, jsonify, url_for
+import threading
+import time
 import json
+from app.db import pool_stats
 from app.model.detection_result import DetectionResult  
+from app.services.detection_jobs import JobLimit, JobStore
+from app.services.detection_results import build_detection_result
+from app.services.write_behind import writes
+from app.services.detection_sessions import SessionLimit, SessionStore
+from app.services.face_mesh_pool import PoolBusy
+from app.response import stream_json
+from app.services.pagination import CountCache, CursorPage, page_limit
+from app.services.uploads import FrameLimit, base64_to_bytes, check_frames, read_length_prefixed
+from config import Config
 
 detection_api = Blueprint('detection_api', __name__)  
 
-model = scaler = mp_face_mesh = face_mesh = None
-lock = threading.Lock()
-FEATURE_COLUMNS = ['eyebrow_dist', 'eye_asymmetry', 'mar', 'mouth_asymmetry', 'pucker_asymmetry']
+_detector = None
+_detector_lock = threading.Lock()
+
+def detector():
+    """Modul ``app.services.detector``, diimpor dan dimuat saat pertama dibutuhkan.
+
+    Stack ML (MediaPipe, OpenCV, NumPy, model) baru dimuat di sini,
+    bukan saat blueprint diimpor, sehingga worker yang hanya melayani
+    route lain tetap ringan. Warmup gunicorn memanggil ini lebih awal.
+    """
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                from app.services import detector as module
+                module.load_model()
+                _detector = module
+    return _detector
+
+def warmup():
+    detector().warmup()
+
+def tracking_face_mesh():
+    return detector().tracking_face_mesh()
+
+sessions = SessionStore(
+    ttl=Config.DETECTION_SESSION_TTL,
+    max_sessions=Config.DETECTION_SESSION_LIMIT,
+    max_frames=Config.DETECTION_SESSION_MAX_FRAMES,
+    face_mesh_factory=tracking_face_mesh if Config.DETECTION_MEDIAPIPE_MODE == 'video' else None,
+    max_trackers=Config.DETECTION_SESSION_TRACKERS
+)
+
+result_counts = CountCache(ttl=Config.DETECTION_RESULTS_COUNT_TTL)
+
+jobs = JobStore(
+    workers=Config.DETECTION_JOB_WORKERS,
+    max_pending=Config.DETECTION_JOB_LIMIT,
+    ttl=Config.DETECTION_JOB_TTL
+)
+
+def busy_response():
+    response = jsonify({'success': False, 'error': 'Detection queue is full, please retry'})
+    response.headers['Retry-After'] = str(Config.DETECTION_RETRY_AFTER)
+    return response, 503
+
+def read_frames():
+    """Ambil frame mentah (bytes) dari request.
+
+    Mendukung tiga format: JSON ``{"frames": [base64, ...]}``, multipart
+    dengan satu part file ``frames`` per frame, dan ``application/octet-stream``
+    berisi frame JPEG dengan prefix panjang uint32 big-endian. Ketiganya
+    dibatasi DETECTION_MAX_FRAMES dan DETECTION_MAX_FRAME_BYTES (FrameLimit).
+    """
+    max_frames, max_bytes = Config.DETECTION_MAX_FRAMES, Config.DETECTION_MAX_FRAME_BYTES
+    if request.mimetype == 'application/octet-stream':
+        return read_length_prefixed(request.stream, max_frames, max_bytes)
+    if request.mimetype == 'multipart/form-data':
+        files = check_frames(request.files.getlist('frames'), max_frames)
+        # satu byte ekstra untuk mengetahui frame yang melewati batas tanpa membaca seluruhnya
+        return check_frames([f.read(max_bytes + 1) for f in files], max_frames, max_bytes)
+    data = request.get_json(silent=True) or {}
+    encoded = check_frames(data.get('frames', []), max_frames)
+    frames = [base64_to_bytes(frame) for frame in encoded]
+    return check_frames([frame for frame in frames if frame is not None], max_frames, max_bytes)
+
+def param(name):
+    """Nilai teks dari query string, form multipart, atau body JSON."""
+    value = request.args.get(name) or request.form.get(name)
+    if value is None and request.is_json:
+        value = (request.get_json(silent=True) or {}).get(name)
+    return value
+
+def option(name, default=False):
+    """Opsi boolean dari query string, form multipart, atau body JSON."""
+    value = param(name)
+    if value is None:
+        return default
+    return str(value).lower() in ('1', 'true', 'yes')
+
+@detection_api.route('/predict_bellspalsy', methods=['POST'])
+def predict_bellspalsy():
+    if not detector().models_ready():
+        return jsonify({'success': False, 'error': 'Model not loaded'}), 503
 
-def load_model():
-    global model, scaler, mp_face_mesh, face_mesh
     try:
-        with open(os.path.join('app', 'ml', 'model_mlp.pkl'), 'rb') as f:
-            model = pickle.load(f)
-        with open(os.path.join('app', 'ml', 'scaler.pkl'), 'rb') as f:
-            scaler = pickle.load(f)
-
-        mp_face_mesh = mp.solutions.face_mesh
-        face_mesh = mp_face_mesh.FaceMesh(
-            static_image_mode=True,
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.5
-        )
+        frames = read_frames()
+    except FrameLimit as e:
+        return jsonify({'success': False, 'error': str(e)}), 413
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    if not frames:
+        return jsonify({'success': False, 'error': 'No frames'}), 400
 
-        print("✅ Bell's Palsy model loaded.")
-    except Exception as e:
-        print(f"❌ Error loading model: {e}")
+    # ?save=true&user_id=... menyimpan hasil langsung dari server, tanpa /save
+    user_id = param('user_id')
+    save = option('save')
+    if save and not user_id:
+        return jsonify({'success': False, 'error': 'Missing required field: user_id'}), 400
+
+    try:
+        payload = detector().detect(frames, adaptive=option('adaptive', Config.DETECTION_ADAPTIVE))
+    except PoolBusy:
+        return busy_response()
 
-def euclidean(p1, p2):
-    return np.linalg.norm(np.array(p1) - np.array(p2))
+    if payload is None:
+        return jsonify({'success': False, 'error': 'No face landmarks'}), 400
+    if save:
+        # ditulis oleh write-behind buffer; respons tidak menunggu MongoDB
+        payload['document_id'] = str(writes.insert(
+            build_detection_result(user_id, payload, frame_count=len(frames))
+        ))
+    return jsonify({'success': True, **payload})
+
+def run_detection_job(frames, adaptive, user_id):
+    """Isi job: deteksi, lalu simpan DetectionResult bila ``user_id`` diberikan."""
+    for attempt in range(Config.DETECTION_JOB_RETRIES + 1):
+        try:
+            payload = detector().detect(frames, adaptive=adaptive)
+            break
+        except PoolBusy:
+            # job berjalan di background, jadi tunggu antrean FaceMesh alih-alih gagal
+            if attempt == Config.DETECTION_JOB_RETRIES:
+                raise ValueError('Detection queue is full, please retry')
+            time.sleep(Config.DETECTION_RETRY_AFTER)
+
+    if payload is None:
+        raise ValueError('No face landmarks')
+    if user_id:
+        document = build_detection_result(user_id, payload, frame_count=len(frames))
+        payload['document_id'] = str(writes.insert(document))
+    return payload
+
+@detection_api.route('/jobs', methods=['POST'])
+def create_detection_job():
+    """Terima frame (format sama dengan predict_bellspalsy) dan proses di background.
+
+    Respons 202 berisi ``job_id``; hasil diambil lewat GET /jobs/<id>.
+    Dengan ``user_id`` hasilnya langsung disimpan ke deteksi_history,
+    tanpa perlu memanggil /save.
+    """
+    if not detector().models_ready():
+        return jsonify({'success': False, 'error': 'Model not loaded'}), 503
 
-def decode_base64_image(data):
     try:
-        if ',' in data: data = data.split(',')[1]
-        if len(data) % 4: data += '=' * (4 - len(data) % 4)
-        return cv2.imdecode(np.frombuffer(base64.b64decode(data), np.uint8), cv2.IMREAD_COLOR)
-    except Exception as e:
-        print(f"❌ decode error: {e}")
-        return None
+        frames = read_frames()
+    except FrameLimit as e:
+        return jsonify({'success': False, 'error': str(e)}), 413
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    if not frames:
+        return jsonify({'success': False, 'error': 'No frames'}), 400
 
-def extract_features(landmarks):
     try:
-        def pt(i): return (landmarks.landmark[i].x, landmarks.landmark[i].y)
-        return pd.DataFrame([{
-            'eyebrow_dist': euclidean(pt(55), pt(285)),
-            'eye_asymmetry': abs(
-                euclidean(pt(159), pt(145)) / (euclidean(pt(33), pt(133)) + 1e-8) -
-                euclidean(pt(386), pt(374)) / (euclidean(pt(362), pt(263)) + 1e-8)
-            ),
-            'mar': euclidean(pt(13), pt(14)) / (euclidean(pt(61), pt(291)) + 1e-8),
-            'mouth_asymmetry': abs(pt(61)[1] - pt(291)[1]),
-            'pucker_asymmetry': abs(pt(78)[0] - pt(308)[0]),
-        }], columns=FEATURE_COLUMNS)
-    except Exception as e:
-        print(f"❌ feature error: {e}")
-        return None
+        job = jobs.submit(run_detection_job, frames, option('adaptive', Config.DETECTION_ADAPTIVE), param('user_id'))
+    except JobLimit as e:
+        response = jsonify({'success': False, 'error': str(e)})
+        response.headers['Retry-After'] = str(Config.DETECTION_RETRY_AFTER)
+        return response, 503
 
-@detection_api.route('/predict_bellspalsy', methods=['POST'])
-def predict_bellspalsy():
-    if not all([model, scaler, face_mesh]):
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': url_for('detection_api.get_detection_job', job_id=job.id)
+    }), 202
+
+@detection_api.route('/jobs/<job_id>', methods=['GET'])
+def get_detection_job(job_id):
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found or expired'}), 404
+    return jsonify({'success': True, **job.to_dict()})
+
+@detection_api.route('/sessions', methods=['POST'])
+def open_session():
+    """Buka sesi deteksi; frame dikirim bertahap ke /sessions/<id>/frames."""
+    if not detector().models_ready():
         return jsonify({'success': False, 'error': 'Model not loaded'}), 503
+    try:
+        session = sessions.create()
+    except SessionLimit as e:
+        response = jsonify({'success': False, 'error': str(e)})
+        response.headers['Retry-After'] = str(Config.DETECTION_RETRY_AFTER)
+        return response, 503
 
-    data = request.json
-    frames = data.get('frames', [])
+    return jsonify({
+        'success': True,
+        'session_id': session.id,
+        'expires_in': sessions.ttl,
+        'max_frames': session.max_frames
+    }), 201
+
+@detection_api.route('/sessions/<session_id>/frames', methods=['POST'])
+def push_session_frames(session_id):
+    """Proses satu potongan frame dan kembalikan probabilitas per frame serta rata-rata berjalan."""
+    session = sessions.get(session_id)
+    if not session:
+        return jsonify({'success': False, 'error': 'Session not found or expired'}), 404
+
+    try:
+        frames = read_frames()
+        session.reserve(len(frames))
+    except FrameLimit as e:
+        return jsonify({'success': False, 'error': str(e)}), 413
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     if not frames:
         return jsonify({'success': False, 'error': 'No frames'}), 400
 
-    features = []
-    with lock:
-        for frame in frames:
-            img = decode_base64_image(frame)
-            if img is None: continue
-            result = face_mesh.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-            if result.multi_face_landmarks:
-                for l in result.multi_face_landmarks:
-                    df = extract_features(l)
-                    if df is not None:
-                        features.append(df)
-
-    if not features:
-        return jsonify({'success': False, 'error': 'No face landmarks'}), 400
+    try:
+        frame_probs = detector().detect_chunk(session, frames)
+    except Exception as e:
+        # potongan yang gagal (termasuk 503) boleh dikirim ulang tanpa memakan kuota sesi
+        session.refund(len(frames))
+        if isinstance(e, PoolBusy):
+            return busy_response()
+        raise
+
+    return jsonify({
+        'success': True,
+        'session_id': session.id,
+        'model_version': session.model_version,
+        'frame_probabilities': frame_probs,
+        'faces_detected': sum(p is not None for p in frame_probs),
+        'frames_received': session.frames_received,
+        'total_frames': session.total_frames,
+        'running_average': session.average
+    })
 
-    df = pd.concat(features, ignore_index=True)
-    scaled = scaler.transform(df)
-    preds = model.predict(scaled)
-    probs = model.predict_proba(scaled)[:, 1]
-    avg_prob = float(probs.mean())
-    is_positive = avg_prob >= 0.5
+@detection_api.route('/sessions/<session_id>/close', methods=['POST'])
+def close_session(session_id):
+    """Tutup sesi dan kembalikan ringkasan yang sama dengan predict_bellspalsy."""
+    session = sessions.close(session_id)
+    if not session:
+        return jsonify({'success': False, 'error': 'Session not found or expired'}), 404
+    if not session.total_frames:
+        return jsonify({'success': False, 'error': 'No face landmarks'}), 400
 
     return jsonify({
         'success': True,
-        'is_positive': is_positive,
-        'prediction': "Bell's Palsy" if is_positive else "Normal",
-        'confidence': avg_prob,
-        'confidence_level': "Tinggi" if avg_prob > 0.7 or avg_prob < 0.3 else "Sedang",
-        'percentage': round(avg_prob * 100, 1),
-        'total_frames': len(preds),
-        'bellspalsy_frames': int((preds == 1).sum()),
-        'normal_frames': int((preds == 0).sum()),
-        'probabilities': {
-            'normal': float(1 - avg_prob),
-            'bells_palsy': avg_prob
-        }
+        'session_id': session.id,
+        **detector().summarize_session(session)
     })
 
+@detection_api.route('/admin/models', methods=['GET', 'POST'])
+def admin_models():
+    """Lihat versi model, atau (POST) muat versi lain di background lalu tukar secara atomik.
+
+    Body POST: ``{"version": "...", "activate": true}``. Dengan ``activate``
+    file CURRENT ikut diganti setelah versi berhasil dimuat, sehingga worker
+    lain menyusul lewat file watcher (MODEL_WATCH_INTERVAL). Butuh header
+    ``X-Admin-Token`` yang sama dengan MODEL_ADMIN_TOKEN.
+    """
+    if not Config.MODEL_ADMIN_TOKEN or request.headers.get('X-Admin-Token') != Config.MODEL_ADMIN_TOKEN:
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+
+    from app.services.model_registry import registry
+    if request.method == 'GET':
+        return jsonify({
+            'success': True,
+            'current': registry.store.current_version(),
+            'versions': registry.store.list_versions(),
+            'active': registry.metadata()
+        })
+
+    data = request.get_json(silent=True) or {}
+    version = data.get('version') or registry.store.current_version()
+    activate = bool(data.get('activate'))
+    if activate and version is None:
+        return jsonify({'success': False, 'error': 'Missing required field: version'}), 400
+    try:
+        # CURRENT baru diganti setelah versi ini berhasil dimuat dan diverifikasi
+        registry.reload_async(version, activate=activate)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return jsonify({
+        'success': True,
+        'message': 'Model reload started',
+        'version': version or 'legacy',
+        'active_version': registry.metadata()['version']
+    }), 202
+
 @detection_api.route('/save', methods=['POST'])
 def save_detection_result():
     """Endpoint untuk menyimpan hasil deteksi ke MongoDB"""
@@ -133,41 +324,19 @@ def save_detection_result():
                 'error': 'Invalid detection result (confidence = 0, not saving)'
             }), 400
 
-        # Siapkan data untuk disimpan
-        input_data = []
-        if 'frames' in data:
-            input_data.append({
-                'type': 'frames',
-                'count': len(data['frames']),
-                'timestamp': datetime.now().isoformat()
-            })
-
-        result_data = {
-            'prediction': data.get('prediction', ''),
-            'is_positive': data.get('is_positive', False),
-            'confidence': confidence,
-            'confidence_level': data.get('confidence_level', ''),
-            'percentage': data.get('percentage', 0.0),
-            'total_frames': data.get('total_frames', 0),
-            'bellspalsy_frames': data.get('bellspalsy_frames', 0),
-            'normal_frames': data.get('normal_frames', 0),
-            'probabilities': data.get('probabilities', {}),
-            'additional_notes': data.get('notes', ''),
-            'processed_at': datetime.now().isoformat()
-        }
-
         # ✅ SIMPAN hanya jika confidence valid
-        detection_result = DetectionResult(
-            user_id=user_id,
-            input_data=input_data,
-            result=result_data
+        detection_result = build_detection_result(
+            user_id,
+            data,
+            frame_count=len(data['frames']) if 'frames' in data else None
         )
 
-        detection_result.save()
+        writes.insert(detection_result)
 
+        # dengan write-behind dokumen baru diantrekan; document_id sudah final
         return jsonify({
             'success': True,
-            'message': 'Detection result saved successfully to MongoDB',
+            'message': 'Detection result queued for saving' if writes.enabled else 'Detection result saved successfully to MongoDB',
             'document_id': str(detection_result.id),
             'user_id': detection_result.user_id,
             'detected_at': detection_result.detected_at.isoformat(),
@@ -184,62 +353,90 @@ def save_detection_result():
 
 @detection_api.route('/detection_health', methods=['GET'])
 def detection_health():
+    stats = detector().stats()
+    # 503 agar load balancer tidak mengirim traffic ke worker yang model/engine-nya gagal dimuat
     return jsonify({
-        'status': 'healthy' if all([model, scaler, face_mesh]) else 'unhealthy',
-        'model_loaded': model is not None,
-        'scaler_loaded': scaler is not None,
-        'mediapipe_initialized': face_mesh is not None
-    })
+        **stats,
+        'sessions': sessions.stats(),
+        'jobs': jobs.stats(),
+        'write_behind': writes.stats(),
+        'mongo_pool': pool_stats()
+    }), 200 if stats['status'] == 'healthy' else 503
+
+def result_dict(detection):
+    """``to_dict`` DetectionResult beserta ``id`` dan ``parsed_result``."""
+    result_dict = detection.to_dict()
+    result_dict['id'] = str(detection.id)
+    # result berupa dict; dokumen lama bisa menyimpannya sebagai string JSON
+    parsed_result = detection.result
+    if isinstance(parsed_result, str):
+        try:
+            parsed_result = json.loads(parsed_result)
+        except json.JSONDecodeError:
+            parsed_result = None
+    result_dict['parsed_result'] = parsed_result or None
+    return result_dict
 
 # Endpoint untuk melihat history hasil deteksi dari MongoDB
 @detection_api.route('/results', methods=['GET'])
 def get_detection_results():
-    """Endpoint untuk mengambil history hasil deteksi dari MongoDB"""
+    """Endpoint untuk mengambil history hasil deteksi dari MongoDB
+
+    Pagination berbasis cursor: kirim ``next_cursor`` dari respons
+    sebelumnya sebagai ``?cursor=``; ``total_count`` hanya dihitung bila
+    ``include_total=true``. Tanpa ``cursor``, ``page``/``limit`` lama
+    tetap didukung (dengan total yang di-cache sebentar).
+    """
     try:
         # Parameter query untuk filtering
         user_id = request.args.get('user_id')
-        limit = int(request.args.get('limit', 50))  # Default 50 records
-        page = int(request.args.get('page', 1))     # Default page 1
-        
+        cursor = request.args.get('cursor')
+        try:
+            limit = page_limit(request.args.get('limit'), 50, Config.DETECTION_RESULTS_MAX_LIMIT)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        try:
+            page = max(int(request.args.get('page', 1)), 1)
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid page'}), 400
+
         # Build query
         query = {}
         if user_id:
             query['user_id'] = user_id
-        
-        # Hitung offset untuk pagination
-        offset = (page - 1) * limit
-        
-        # Query ke MongoDB
-        detection_results = DetectionResult.objects(**query).order_by('-detected_at').skip(offset).limit(limit)
-        total_count = DetectionResult.objects(**query).count()
-        
-        # Convert ke dictionary
-        results = []
-        for detection in detection_results:
-            result_dict = detection.to_dict()
-            result_dict['id'] = str(detection.id)
-            
-            # Parse JSON result jika memungkinkan
-            try:
-                if detection.result:
-                    parsed_result = json.loads(detection.result)
-                    result_dict['parsed_result'] = parsed_result
-            except json.JSONDecodeError:
-                result_dict['parsed_result'] = None
-            
-            results.append(result_dict)
-        
-        return jsonify({
-            'success': True,
-            'results': results,
-            'count': len(results),
-            'total_count': total_count,
-            'page': page,
-            'limit': limit,
-            'total_pages': (total_count + limit - 1) // limit,
-            'has_next': offset + limit < total_count,
-            'has_prev': page > 1
-        })
+        detection_results = DetectionResult.objects(**query)
+        if not cursor:
+            detection_results = detection_results.skip((page - 1) * limit)
+
+        # Query ke MongoDB, dibaca langsung saat respons di-stream
+        try:
+            detections = CursorPage(detection_results, 'detected_at', cursor, limit)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+
+        total_count = None
+        if not cursor or option('include_total'):
+            total_count = result_counts.get(user_id, lambda: DetectionResult.objects(**query).count())
+
+        def tail(count):
+            meta = {
+                'count': count,
+                'limit': limit,
+                'has_next': detections.has_next,
+                'next_cursor': detections.next_cursor
+            }
+            if total_count is not None:
+                meta['total_count'] = total_count
+            if not cursor:
+                meta.update({
+                    'page': page,
+                    'total_pages': (total_count + limit - 1) // limit,
+                    'has_prev': page > 1
+                })
+            return meta
+
+        return stream_json((result_dict(detection) for detection in detections),
+                           key='results', head={'success': True}, tail=tail)
         
     except Exception as e:
         print(f"❌ Error getting detection results from MongoDB: {e}")
@@ -261,20 +458,9 @@ def get_detection_result_detail(result_id):
                 'error': 'Detection result not found'
             }), 404
         
-        result_dict = detection_result.to_dict()
-        result_dict['id'] = str(detection_result.id)
-        
-        # Parse JSON result
-        try:
-            if detection_result.result:
-                parsed_result = json.loads(detection_result.result)
-                result_dict['parsed_result'] = parsed_result
-        except json.JSONDecodeError:
-            result_dict['parsed_result'] = None
-        
         return jsonify({
             'success': True,
-            'result': result_dict
+            'result': result_dict(detection_result)
         })
         
     except Exception as e:
@@ -317,19 +503,9 @@ def get_latest_detection_result(user_id):
     try:
         result = DetectionResult.objects(user_id=user_id).order_by('-detected_at').first()
         if result:
-            result_dict = result.to_dict()
-            result_dict['id'] = str(result.id)
-
-            try:
-                if result.result:
-                    parsed_result = json.loads(result.result)
-                    result_dict['parsed_result'] = parsed_result
-            except json.JSONDecodeError:
-                result_dict['parsed_result'] = None
-
             return jsonify({
                 'success': True,
-                'result': result_dict
+                'result': result_dict(result)
             }), 200
 
         return jsonify({'success': True, 'result': None}), 200
@@ -340,6 +516,3 @@ def get_latest_detection_result(user_id):
             'success': False,
             'error': f'Failed to get latest result: {str(e)}'
         }), 500
-
-
-load_model()
\ No newline at end of file
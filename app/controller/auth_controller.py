@@ -6,6 +6,7 @@ from google.auth.transport import requests as google_requests
 import datetime, random, os, pytz
 from app.model.user import User
 from app.model.login_history import LoginHistory
+from app.services.write_behind import writes
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import smtplib
@@ -76,8 +77,9 @@ class AuthController:
             return jsonify({'message': 'Invalid email/password or not verified'}), 401
 
         token = create_access_token(identity=str(user.id), expires_delta=datetime.timedelta(hours=1))
-        user.update(updated_at=get_wib_time())
-        LoginHistory(user_id=str(user.id), device=device, login_time=get_wib_time()).save()
+        # ditulis oleh write-behind buffer agar login tidak menunggu MongoDB
+        writes.update(user, updated_at=get_wib_time())
+        writes.insert(LoginHistory(user_id=str(user.id), device=device, login_time=get_wib_time()))
 
         return jsonify({
             'access_token': token,
@@ -1,12 +1,12 @@
-import os
-import joblib
 import numpy as np
 from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.model.detection_result import DetectionResult
-
-MODEL_PATH = os.path.join("app", "ml", "model_mlp.pkl")
-model = joblib.load(MODEL_PATH)
+from app.services.model_registry import registry
+from app.response import stream_json
+from app.services.pagination import CursorPage, page_limit
+from app.services.write_behind import writes
+from config import Config
 
 class MLController:
     @staticmethod
@@ -20,14 +20,17 @@ class MLController:
                 return jsonify({"message": "Input harus berupa list."}), 400
 
             input_array = np.array(input_data).reshape(1, -1)
+            model = registry.get('mlp')
+            if model is None:
+                return jsonify({"message": "Model sklearn tidak tersedia untuk versi ini."}), 503
             prediction = model.predict(input_array)[0]
             user_id = get_jwt_identity()
 
-            DetectionResult(
+            writes.insert(DetectionResult(
                 user_id=user_id,
                 input_data=input_data,
                 result=str(prediction)
-            ).save()
+            ))
 
             return jsonify({
                 "result": str(prediction),
@@ -42,16 +45,19 @@ class MLController:
     def get_history():
         try:
             user_id = get_jwt_identity()
-            results = DetectionResult.objects(user_id=user_id).order_by('-detected_at')
-            return jsonify({
-                "status": "success",
-                "data": [
-                    {
-                        "input": r.input_data,
-                        "result": r.result,
-                        "detected_at": r.detected_at.isoformat()
-                    } for r in results
-                ]
-            }), 200
+            limit = page_limit(request.args.get('limit'), Config.HISTORY_PAGE_SIZE, Config.HISTORY_MAX_LIMIT)
+            results = CursorPage(
+                DetectionResult.objects(user_id=user_id).only('input_data', 'result', 'detected_at').as_pymongo(),
+                'detected_at', request.args.get('cursor'), limit
+            )
+            data = ({
+                "input": r.get('input_data', []),
+                "result": r.get('result'),
+                "detected_at": r['detected_at'].isoformat()
+            } for r in results)
+            return stream_json(data, head={"status": "success"},
+                               tail=lambda count: {"next_cursor": results.next_cursor})
+        except ValueError as e:
+            return jsonify({"message": f"Parameter tidak valid: {str(e)}"}), 400
         except Exception as e:
             return jsonify({"message": f"Gagal ambil riwayat: {str(e)}"}), 500
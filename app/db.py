@@ -0,0 +1,151 @@
+"""MongoClient bersama per proses untuk mongoengine, Flask-PyMongo dan pemanggil langsung."""
+import os
+import threading
+
+from flask_pymongo.helpers import BSONObjectIdConverter, BSONProvider
+from flask_pymongo.wrappers import MongoClient
+from mongoengine import connect
+from mongoengine import connection as mongoengine_connection
+from mongoengine.base import _document_registry
+from pymongo import monitoring
+from pymongo.errors import ConfigurationError
+
+from config import Config
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Penghitung event pool koneksi pymongo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = dict.fromkeys(
+                ['created', 'closed', 'checked_out', 'checked_in', 'checkout_failed', 'pool_cleared'], 0)
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._count('pool_cleared')
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._count('created')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._count('closed')
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._count('checkout_failed')
+
+    def connection_checked_out(self, event):
+        self._count('checked_out')
+
+    def connection_checked_in(self, event):
+        self._count('checked_in')
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            **counters,
+            'open': counters['created'] - counters['closed'],
+            'in_use': counters['checked_out'] - counters['checked_in']
+        }
+
+
+metrics = PoolMetrics()
+_client = None
+_pid = None
+_lock = threading.Lock()
+_pymongo_bindings = []
+
+
+def client():
+    """MongoClient milik proses ini (dibuat saat pertama dipakai)."""
+    global _client, _pid
+    if _pid != os.getpid():
+        with _lock:
+            if _pid != os.getpid():
+                _client = MongoClient(
+                    Config.MONGO_URI,
+                    maxPoolSize=Config.MONGO_MAX_POOL_SIZE,
+                    minPoolSize=Config.MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=Config.MONGO_MAX_IDLE_MS,
+                    serverSelectionTimeoutMS=Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    connectTimeoutMS=Config.MONGO_CONNECT_TIMEOUT_MS,
+                    connect=False,
+                    event_listeners=[metrics]
+                )
+                _pid = os.getpid()
+    return _client
+
+def database(name=None):
+    """Database ``name``; default DB_DATABASE, atau database di MONGO_URI."""
+    name = name or Config.MONGO_DB
+    return client()[name] if name else client().get_default_database()
+
+def _shared_client(**settings):
+    # dipakai mongoengine sebagai mongo_client_class; pengaturannya diabaikan
+    return client()
+
+def connect_mongoengine():
+    """Daftarkan koneksi default mongoengine yang memakai ``client()``."""
+    connect(db=Config.MONGO_DB, host=Config.MONGO_URI, mongo_client_class=_shared_client)
+
+def _bind_pymongo(mongo):
+    mongo.cx = client()
+    try:
+        mongo.db = database()
+    except ConfigurationError:
+        # sama seperti Flask-PyMongo: tanpa nama database, hanya ``cx`` yang tersedia
+        mongo.db = None
+
+def init_pymongo(mongo, app):
+    """Pasang client bersama ke objek Flask-PyMongo, tanpa client tambahan dari ``init_app``."""
+    _bind_pymongo(mongo)
+    app.url_map.converters['ObjectId'] = BSONObjectIdConverter
+    app.json = BSONProvider(app)
+    _pymongo_bindings.append(mongo)
+
+def pool_stats():
+    return {
+        'max_pool_size': Config.MONGO_MAX_POOL_SIZE,
+        'min_pool_size': Config.MONGO_MIN_POOL_SIZE,
+        'created_in_process': _pid == os.getpid(),
+        **metrics.stats()
+    }
+
+def _after_fork_in_child():
+    """Buang client dan cache koneksi milik proses induk; dibuat ulang saat pertama dipakai."""
+    global _client, _pid
+    _client, _pid = None, None
+    metrics.reset()
+    # mongoengine menyimpan client, database dan collection per Document
+    mongoengine_connection._connections.clear()
+    mongoengine_connection._dbs.clear()
+    for document in _document_registry.values():
+        if getattr(document, '_collection', None) is not None:
+            document._collection = None
+    for mongo in _pymongo_bindings:
+        _bind_pymongo(mongo)
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
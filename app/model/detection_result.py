@@ -9,7 +9,14 @@ class DetectionResult(Document):
     detected_at = DateTimeField(default=lambda: datetime.now(pytz.timezone("Asia/Jakarta")))
 
     meta = {
-        'collection': 'deteksi_history'
+        'collection': 'deteksi_history',
+        # indeks dibuat saat deploy lewat scripts/ensure_indexes.py, bukan saat request
+        'auto_create_index': False,
+        'indexes': [
+            # -_id menjadi penentu urutan untuk pagination cursor (detected_at, _id)
+            ('user_id', '-detected_at', '-_id'),
+            ('-detected_at', '-_id')
+        ]
     }
 
     def to_dict(self):
@@ -10,4 +10,8 @@ class LoginHistory(Document):
     device = StringField()
     login_time = DateTimeField(default=get_jakarta_time)
 
-    meta = {'collection': 'login_history'}
+    meta = {
+        'collection': 'login_history',
+        'auto_create_index': False,
+        'indexes': [('user_id', '-login_time')]
+    }
@@ -6,3 +6,8 @@ class PasswordHistory(Document):
     old_password = StringField(required=True)
     new_password = StringField(required=True)
     changed_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'auto_create_index': False,
+        'indexes': [('user_id', '-changed_at')]
+    }
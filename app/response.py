@@ -1,4 +1,6 @@
-from flask import jsonify, make_response
+import itertools
+
+from flask import Response, current_app, jsonify, make_response, request, stream_with_context
 
 def success(values,message):
     res = {
@@ -15,4 +17,70 @@ def badRequest(values,message):
         'message': message
     }
 
-    return make_response(jsonify(res)), 400
\ No newline at end of file
+    return make_response(jsonify(res)), 400
+
+def wants_ndjson():
+    """True bila klien meminta NDJSON (``?format=ndjson`` atau header Accept)."""
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+
+
+def stream_json(rows, key='data', head=None, tail=None, status=200, chunk_size=64 * 1024):
+    """Kirim ``{**head, key: [rows...], **tail(count)}`` (atau NDJSON) secara streaming per ``chunk_size`` byte.
+
+    Error di tengah stream mengakhiri respons dengan record ``{"error": {...}}``.
+    """
+    dumps = current_app.json.dumps
+    ndjson = wants_ndjson()
+    # baris pertama diambil sekarang agar error query muncul sebelum status 200 terkirim
+    rows = iter(rows)
+    first = next(rows, None)
+    rows = itertools.chain([first], rows) if first is not None else rows
+
+    def generate():
+        buffer, size, count = [], 0, 0
+        if not ndjson:
+            if key is None:
+                buffer.append('[')
+            else:
+                prefix = dumps(head)[:-1] + ',' if head else '{'
+                buffer.append(prefix + dumps(key) + ':[')
+        try:
+            for row in rows:
+                text = dumps(row)
+                if ndjson:
+                    text += '\n'
+                elif count:
+                    text = ',' + text
+                buffer.append(text)
+                size += len(text)
+                count += 1
+                if size >= chunk_size:
+                    yield ''.join(buffer)
+                    buffer, size = [], 0
+            meta = tail(count) if tail else {}
+        except Exception as e:
+            # status 200 sudah terkirim: tutup dokumen dengan record error agar klien tahu hasilnya terpotong
+            print(f"❌ Error streaming response after {count} rows: {e}")
+            error = {'success': False, 'error': f'Failed to stream results: {e}', 'count': count}
+            if ndjson:
+                buffer.append(dumps({'error': error}) + '\n')
+            elif key is None:
+                buffer.append((',' if count else '') + dumps({'error': error}) + ']')
+            else:
+                buffer.append('],' + dumps({'error': error})[1:])
+            yield ''.join(buffer)
+            return
+        if ndjson:
+            if head or meta:
+                buffer.append(dumps({'meta': {**(head or {}), **meta}}) + '\n')
+        elif key is None:
+            buffer.append(']')
+        else:
+            suffix = dumps(meta)
+            buffer.append(']' + (',' + suffix[1:] if meta else '}'))
+        yield ''.join(buffer)
+
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    return Response(stream_with_context(generate()), status=status, mimetype=mimetype)
@@ -1,5 +1,5 @@
-from flask import Blueprint, jsonify, current_app
-from pymongo import MongoClient
+from flask import Blueprint, jsonify
+from app.db import database
 import urllib.parse
 
 
@@ -24,9 +24,7 @@ def parse_views(view_str):
 
 @chart.route("/top-videos", methods=["GET"])
 def get_top_videos():
-    client = MongoClient(current_app.config["MONGO_URI"])
-    db = client["big_data"]
-    collection = db["crawling_yt_revisi1"]
+    collection = database("big_data")["crawling_yt_revisi1"]
 
     videos = []
     for doc in collection.find():
@@ -44,9 +42,7 @@ def get_top_videos():
 @chart.route('/top-channels', methods=['GET'])
 def top_channels():
     # Koneksi ke MongoDB
-    client = MongoClient(current_app.config["MONGO_URI"])
-    db = client["big_data"]
-    collection = db["crawling_yt_revisi1"]
+    collection = database("big_data")["crawling_yt_revisi1"]
 
     # Pipeline agregasi MongoDB
     pipeline = [
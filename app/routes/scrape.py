@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify
 import requests
 from bs4 import BeautifulSoup
 from app.model.article import Article
+from app.response import stream_json
 from datetime import datetime
 
 scrape_bp = Blueprint('scrape_bp', __name__)  # ✅ Pakai nama unik
@@ -73,10 +74,11 @@ def scrape_bells_palsy():
 
 @scrape_bp.route('/bells_palsy_articles', methods=['GET'])
 def get_articles():
-    articles = Article.objects().order_by('-timestamp')
-    return jsonify([{
-        'id': str(a.id),
-        'title': a.title,
-        'definisi': a.definisi[:100] + "...",
-        'full_definisi': a.definisi
-    } for a in articles]), 200
+    articles = Article.objects().order_by('-timestamp').only('title', 'definisi').as_pymongo()
+    # di-stream langsung dari cursor Mongo, tanpa menampung semua artikel di memori
+    return stream_json(({
+        'id': str(a['_id']),
+        'title': a.get('title'),
+        'definisi': (a.get('definisi') or '')[:100] + "...",
+        'full_definisi': a.get('definisi')
+    } for a in articles), key=None)
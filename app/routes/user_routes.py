@@ -8,6 +8,10 @@ from app.model.user import User
 from app.model.login_history import LoginHistory
 from app.model.password_history import PasswordHistory
 from app.model.detection_result import DetectionResult
+from app.response import stream_json
+from app.services.pagination import CursorPage, page_limit
+from app.services.write_behind import writes
+from config import Config
 
 
 users = Blueprint('users', __name__)
@@ -108,7 +112,7 @@ def change_password():
 
 @users.route('/history-login/<user_id>', methods=['GET'])
 def get_login_history(user_id):
-    history = LoginHistory.objects(user_id=user_id).order_by('-timestamp')
+    history = LoginHistory.objects(user_id=user_id).order_by('-login_time')
     return jsonify({
         'status': 'success',
         'data': [
@@ -135,18 +139,26 @@ def get_password_history(user_id):
 @users.route('/detection-history', methods=['GET'])
 @jwt_required()
 def get_detection_history():
+    """Riwayat deteksi user, terbaru dulu, per halaman (``limit`` dan ``cursor``)."""
     user_id = get_jwt_identity()
-    detections = DetectionResult.objects(user_id=user_id).order_by('-detected_at')
-
-    data = []
-    for det in detections:
-        data.append({
-            "user_id": det.user_id,
-            "result": det.result,  # langsung dictionary, no json.loads
-            "detected_at": det.detected_at.isoformat()
-        })
-
-    return jsonify({"status": "success", "data": data}), 200
+    try:
+        limit = page_limit(request.args.get('limit'), Config.HISTORY_PAGE_SIZE, Config.HISTORY_MAX_LIMIT)
+        # as_pymongo + only: dict mentah berisi field yang dikembalikan saja, tanpa Document
+        detections = CursorPage(
+            DetectionResult.objects(user_id=user_id).only('result', 'detected_at').as_pymongo(),
+            'detected_at', request.args.get('cursor'), limit
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    data = ({
+        "user_id": user_id,
+        "result": det.get('result'),  # langsung dictionary, no json.loads
+        "detected_at": det['detected_at'].isoformat()
+    } for det in detections)
+
+    return stream_json(data, head={"status": "success"},
+                       tail=lambda count: {"next_cursor": detections.next_cursor})
 
 @users.route('/detect', methods=['POST'])
 @jwt_required()
@@ -179,7 +191,7 @@ def detect_and_save():
         result=prediction_result,
         detected_at=datetime.now(pytz.timezone("Asia/Jakarta"))
     )
-    detection.save()
+    writes.insert(detection)
 
     return jsonify({
         "status": "success",
@@ -0,0 +1,103 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class BatchScheduler:
+    """Gabungkan inference request yang bersamaan: flush tiap ``max_rows`` baris atau ``max_wait`` detik."""
+
+    def __init__(self, max_rows=256, max_wait=0.002):
+        self.max_rows = max_rows
+        self.max_wait = max_wait
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys(['batches', 'requests', 'rows'], 0)
+
+    def _ensure_started(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue()
+                    threading.Thread(target=self._loop, args=(self._queue,),
+                                     name='inference-batcher', daemon=True).start()
+                    self._pid = os.getpid()
+        return self._queue
+
+    def predict_proba(self, predictor, features):
+        future = Future()
+        self._ensure_started().put((predictor, features, future))
+        return future.result()
+
+    def bind(self, predictor):
+        return BatchedPredictor(self, predictor)
+
+    def _loop(self, q):
+        while True:
+            batch = [q.get()]
+            rows = len(batch[0][1])
+            deadline = time.monotonic() + self.max_wait
+            while rows < self.max_rows:
+                try:
+                    item = q.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                batch.append(item)
+                rows += len(item[1])
+            self._flush(batch)
+
+    def _flush(self, batch):
+        groups = {}
+        for item in batch:
+            groups.setdefault(id(item[0]), []).append(item)
+        for items in groups.values():
+            predictor = items[0][0]
+            try:
+                probs = predictor.predict_proba(np.vstack([features for _, features, _ in items]))
+            except Exception as e:
+                for _, _, future in items:
+                    future.set_exception(e)
+                continue
+            start = 0
+            for _, features, future in items:
+                future.set_result(probs[start:start + len(features)])
+                start += len(features)
+        with self._lock:
+            self.counters['batches'] += 1
+            self.counters['requests'] += len(batch)
+            self.counters['rows'] += sum(len(features) for _, features, _ in batch)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        batches = counters['batches']
+        return {
+            **counters,
+            'avg_requests_per_batch': round(counters['requests'] / batches, 2) if batches else None,
+            'max_rows': self.max_rows,
+            'max_wait_ms': self.max_wait * 1000,
+            'queued': self._queue.qsize() if self._pid == os.getpid() else 0
+        }
+
+
+class BatchedPredictor:
+    """Predictor yang ``predict_proba``-nya lewat ``BatchScheduler``."""
+
+    def __init__(self, scheduler, predictor):
+        self.scheduler = scheduler
+        self.predictor = predictor
+
+    def predict_proba(self, features):
+        return self.scheduler.predict_proba(self.predictor, features)
+
+
+def create_batcher(config):
+    """Scheduler sesuai konfigurasi; None bila ``DETECTION_BATCH_WAIT_MS`` 0 (dimatikan)."""
+    if config.DETECTION_BATCH_WAIT_MS <= 0:
+        return None
+    return BatchScheduler(max_rows=config.DETECTION_BATCH_MAX_ROWS,
+                          max_wait=config.DETECTION_BATCH_WAIT_MS / 1000)
@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobLimit(Exception):
+    """Jumlah job yang menunggu/berjalan sudah mencapai batas."""
+
+
+class DetectionJob:
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+
+    @property
+    def pending(self):
+        return self.status in ('queued', 'running')
+
+    def to_dict(self):
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+        if self.status == 'done':
+            data['result'] = self.result
+        elif self.status == 'failed':
+            data['error'] = self.error
+        return data
+
+
+class JobStore:
+    """Job deteksi asinkron in-memory per proses; job selesai dibuang setelah ``ttl`` detik."""
+
+    def __init__(self, workers=2, max_pending=32, ttl=600):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self):
+        if self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='detection-job')
+            self._pid = os.getpid()
+        return self._executor
+
+    def _purge(self, now):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if not job.pending and job.finished_at is not None and now - job.finished_at > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, fn, *args):
+        """Jadwalkan ``fn(*args)``; hasilnya (dict) menjadi ``job.result``. JobLimit bila penuh."""
+        with self._lock:
+            self._purge(time.time())
+            if sum(job.pending for job in self._jobs.values()) >= self.max_pending:
+                raise JobLimit("Too many detection jobs in progress")
+            job = DetectionJob(uuid.uuid4().hex)
+            self._jobs[job.id] = job
+            executor = self._get_executor()
+        executor.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job, fn, args):
+        job.started_at = time.time()
+        job.status = 'running'
+        try:
+            job.result = fn(*args)
+            status = 'done'
+        except ValueError as e:
+            job.error = str(e)
+            status = 'failed'
+        except Exception as e:
+            print(f"❌ Error in detection job {job.id}: {e}")
+            job.error = f"Detection failed: {e}"
+            status = 'failed'
+        # finished_at diisi sebelum status berubah: _purge membaca keduanya tanpa lock job
+        job.finished_at = time.time()
+        job.status = status
+
+    def get(self, job_id):
+        with self._lock:
+            self._purge(time.time())
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            **{status: statuses.count(status) for status in ('queued', 'running', 'done', 'failed')}
+        }
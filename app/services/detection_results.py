@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from app.model.detection_result import DetectionResult
+
+
+def build_detection_result(user_id, data, frame_count=None, notes=None):
+    """Dokumen ``DetectionResult`` dari payload hasil deteksi.
+
+    ``data`` berformat respons predict_bellspalsy, baik hasil hitungan
+    server maupun yang dikirim ulang klien ke /save. ``frame_count``
+    mengisi ``input_data`` bila jumlah frame diketahui.
+    """
+    input_data = []
+    if frame_count is not None:
+        input_data.append({
+            'type': 'frames',
+            'count': frame_count,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    result_data = {
+        'prediction': data.get('prediction', ''),
+        'is_positive': data.get('is_positive', False),
+        'confidence': data.get('confidence', 0.0),
+        'confidence_level': data.get('confidence_level', ''),
+        'percentage': data.get('percentage', 0.0),
+        'total_frames': data.get('total_frames', 0),
+        'bellspalsy_frames': data.get('bellspalsy_frames', 0),
+        'normal_frames': data.get('normal_frames', 0),
+        'probabilities': data.get('probabilities', {}),
+        'additional_notes': notes if notes is not None else data.get('notes', ''),
+        'processed_at': datetime.now().isoformat()
+    }
+    if data.get('model_version'):
+        result_data['model_version'] = data['model_version']
+
+    return DetectionResult(user_id=user_id, input_data=input_data, result=result_data)
+
@@ -0,0 +1,150 @@
+import threading
+import time
+import uuid
+
+from app.services.face_mesh_pool import PoolBusy
+
+
+class SessionLimit(Exception):
+    """Jumlah sesi aktif sudah mencapai batas."""
+
+
+class DetectionSession:
+    """Agregat berjalan satu sesi deteksi (jumlah dan total probabilitas, bukan frame)."""
+
+    def __init__(self, session_id, max_frames, face_mesh_factory=None, trackers=None):
+        self.id = session_id
+        self.max_frames = max_frames
+        self.face_mesh_factory = face_mesh_factory
+        self.trackers = trackers
+        self.face_mesh = None
+        self.model_version = None
+        self.track_lock = threading.Lock()
+        self.created_at = self.last_seen = time.monotonic()
+        self.frames_received = 0
+        self.total_frames = 0
+        self.positive_frames = 0
+        self.prob_sum = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def average(self):
+        return self.prob_sum / self.total_frames if self.total_frames else None
+
+    def reserve(self, count):
+        """Catat ``count`` frame masuk; ValueError bila melewati ``max_frames``."""
+        with self.lock:
+            if self.frames_received + count > self.max_frames:
+                raise ValueError(f"Session accepts at most {self.max_frames} frames")
+            self.frames_received += count
+
+    def refund(self, count):
+        """Batalkan ``reserve(count)`` untuk potongan yang gagal diproses."""
+        with self.lock:
+            self.frames_received -= count
+
+    @property
+    def tracking(self):
+        return self.face_mesh_factory is not None
+
+    def track(self, fn, frames):
+        """Jalankan ``fn(face_mesh, frames)`` memakai FaceMesh milik sesi, berurutan per sesi.
+
+        FaceMesh baru dibuat bila masih ada slot ``trackers``; selain itu ``PoolBusy``.
+        """
+        with self.track_lock:
+            if self.face_mesh is None:
+                if self.trackers is not None and not self.trackers.acquire(blocking=False):
+                    raise PoolBusy("All session trackers are in use")
+                try:
+                    self.face_mesh = self.face_mesh_factory()
+                except BaseException:
+                    if self.trackers is not None:
+                        self.trackers.release()
+                    raise
+            return fn(self.face_mesh, frames)
+
+    def release(self):
+        with self.track_lock:
+            if self.face_mesh is not None:
+                self.face_mesh.close()
+                self.face_mesh = None
+                if self.trackers is not None:
+                    self.trackers.release()
+
+    def add(self, labels, probs):
+        with self.lock:
+            self.total_frames += len(probs)
+            self.positive_frames += int(labels.sum())
+            self.prob_sum += float(probs.sum())
+            return self.average
+
+
+class SessionStore:
+    """Sesi deteksi in-memory per proses dengan TTL idle dan jumlah maksimum."""
+
+    def __init__(self, ttl=120, max_sessions=256, max_frames=600, face_mesh_factory=None, max_trackers=1):
+        self.face_mesh_factory = face_mesh_factory
+        # jumlah FaceMesh sesi yang boleh hidup bersamaan (mode video)
+        self.max_trackers = max(1, int(max_trackers))
+        self._trackers = threading.BoundedSemaphore(self.max_trackers)
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_frames = max_frames
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _purge(self, now):
+        """Keluarkan sesi kedaluwarsa; dipanggil dengan ``_lock`` dipegang."""
+        expired = [sid for sid, s in self._sessions.items() if now - s.last_seen > self.ttl]
+        return [self._sessions.pop(sid) for sid in expired]
+
+    def _release(self, expired):
+        # FaceMesh ditutup di luar _lock karena bisa menunggu track() yang sedang berjalan
+        for session in expired:
+            session.release()
+
+    def create(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = self._purge(now)
+            if len(self._sessions) >= self.max_sessions:
+                session = None
+            else:
+                session = DetectionSession(uuid.uuid4().hex, self.max_frames, self.face_mesh_factory,
+                                           self._trackers)
+                self._sessions[session.id] = session
+        self._release(expired)
+        if session is None:
+            raise SessionLimit("Too many active detection sessions")
+        return session
+
+    def get(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            expired = self._purge(now)
+            session = self._sessions.get(session_id)
+            if session:
+                session.last_seen = now
+        self._release(expired)
+        return session
+
+    def close(self, session_id):
+        with self._lock:
+            expired = self._purge(time.monotonic())
+            session = self._sessions.pop(session_id, None)
+        self._release(expired)
+        if session:
+            session.release()
+        return session
+
+    def stats(self):
+        with self._lock:
+            return {
+                'active': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'ttl': self.ttl,
+                'tracking': self.face_mesh_factory is not None,
+                'trackers_in_use': sum(s.face_mesh is not None for s in self._sessions.values()),
+                'max_trackers': self.max_trackers
+            }
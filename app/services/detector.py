@@ -0,0 +1,147 @@
+"""Bagian deteksi Bell's Palsy yang membutuhkan stack ML.
+
+Modul ini menarik NumPy, OpenCV dan MediaPipe serta memuat model,
+jadi hanya diimpor lewat ``app.api.detection_api.detector()`` saat endpoint
+deteksi pertama kali dipakai (atau saat warmup gunicorn). Blueprint lain
+tidak ikut menanggung biaya startup dan memorinya.
+"""
+import numpy as np
+
+from app.services.batching import create_batcher
+from app.services.feature_cache import create_feature_cache
+from app.services.features import FEATURE_COLUMNS, valid_rows
+from app.services.frames import create_face_mesh, synthetic_frame
+from app.services.inference import classify, summarize, summarize_counts
+from app.services.landmark_engine import create_engine, frame_processor, roi_padding
+from app.services.model_registry import registry
+from app.services.sampling import run_adaptive
+from config import Config
+
+engine = None
+cache = None
+batcher = create_batcher(Config)
+process = frame_processor(Config)
+
+
+def load_artifacts():
+    """Muat artefak model saja, tanpa FaceMesh; aman dipanggil di master gunicorn sebelum fork."""
+    try:
+        registry.bundle()
+        print(f"✅ Bell's Palsy model {registry.metadata()['version']} loaded.")
+    except Exception as e:
+        print(f"❌ Error loading model: {e}")
+
+def load_model():
+    global engine, cache
+    # model dan engine dimuat terpisah: model yang gagal bisa menyusul lewat reload/watcher
+    load_artifacts()
+    registry.watch(Config.MODEL_WATCH_INTERVAL)
+
+    try:
+        # FaceMesh dibuat sekarang; bila MediaPipe gagal, engine tetap None dan endpoint menjawab 503
+        candidate = create_engine(Config)
+        candidate.start()
+        engine = candidate
+        cache = create_feature_cache(Config)
+        print(f"✅ Detection engine ready ({engine.name} backend).")
+        if Config.DETECTION_ROI_CROP and roi_padding(Config) is None:
+            print("⚠️ DETECTION_ROI_CROP ignored: needs static mode and DETECTION_FEATURE_CACHE_SIZE=0")
+    except Exception as e:
+        print(f"❌ Error initializing detection engine: {e}")
+
+def models_ready():
+    return engine is not None and registry.loaded('predictor')
+
+def warmup():
+    """Jalankan satu frame sintetis lewat engine dan model sebelum worker menerima traffic.
+
+    Graph MediaPipe dan model diinisialisasi di sini sehingga request
+    pertama tidak menanggung biayanya. RuntimeError bila engine atau model
+    gagal dimuat.
+    """
+    if engine is None:
+        load_model()
+    if not models_ready():
+        # load_model hanya mencatat error; warmup harus gagal agar worker tidak terlihat siap
+        raise RuntimeError(f"Detection not ready (engine={engine is not None}, "
+                           f"model={registry.loaded('predictor')})")
+    engine.warmup([synthetic_frame()])
+    registry.get('predictor').predict_proba(np.zeros((1, len(FEATURE_COLUMNS))))
+
+def run_frames(frames):
+    """Matriks fitur frame lewat engine; frame yang sudah di-cache tidak diproses ulang."""
+    if cache is None:
+        return engine.run(frames)
+    return cache.run(engine.run, frames)
+
+def predictor(bundle):
+    """Predictor bundle, lewat micro-batching bila diaktifkan."""
+    if batcher is None:
+        return bundle['predictor']
+    return batcher.bind(bundle['predictor'])
+
+def tracking_face_mesh():
+    return create_face_mesh(False)
+
+def detect(frames, adaptive=False):
+    """Jalankan deteksi penuh; payload predict_bellspalsy, atau None bila tidak ada wajah."""
+    bundle = registry.bundle()
+    model = predictor(bundle)
+    if adaptive:
+        features, frames_used = run_adaptive(
+            run_frames,
+            lambda f: model.predict_proba(f)[:, 1],
+            frames,
+            Config.DETECTION_THRESHOLD,
+            z=Config.DETECTION_ADAPTIVE_Z,
+            min_frames=Config.DETECTION_ADAPTIVE_MIN_FRAMES,
+            batch_size=Config.DETECTION_ADAPTIVE_BATCH
+        )
+    else:
+        features = run_frames(frames)
+        features = features[valid_rows(features)]
+
+    if len(features) == 0:
+        return None
+
+    labels, probs = classify(model, features, Config.DETECTION_THRESHOLD)
+    payload = summarize(labels, probs, Config.DETECTION_THRESHOLD)
+    payload['model_version'] = bundle.version
+    if adaptive:
+        payload['frames_submitted'] = len(frames)
+        payload['frames_used'] = frames_used
+        payload['early_exit'] = frames_used < len(frames)
+    return payload
+
+def detect_chunk(session, frames):
+    """Proses satu potongan frame sesi; kembalikan probabilitas per frame (None bila tanpa wajah)."""
+    bundle = registry.bundle()
+    features = session.track(process, frames) if session.tracking else run_frames(frames)
+    found = valid_rows(features)
+    frame_probs = [None] * len(frames)
+    session.model_version = bundle.version
+    if found.any():
+        labels, probs = classify(predictor(bundle), features[found], Config.DETECTION_THRESHOLD)
+        session.add(labels, probs)
+        for i, p in zip(found.nonzero()[0], probs):
+            frame_probs[i] = float(p)
+    return frame_probs
+
+def summarize_session(session):
+    payload = summarize_counts(session.average, session.total_frames, session.positive_frames,
+                               Config.DETECTION_THRESHOLD)
+    payload['model_version'] = session.model_version
+    return payload
+
+def stats():
+    return {
+        'status': 'healthy' if models_ready() else 'unhealthy',
+        'model_loaded': registry.loaded('predictor'),
+        # scaler ikut tersimpan di model.npz, atau dimuat dari scaler.pkl
+        'scaler_loaded': registry.loaded('npz') or registry.loaded('scaler'),
+        'mediapipe_initialized': engine is not None and engine.started,
+        'models': registry.metadata(),
+        'engine': engine.stats() if engine else None,
+        'feature_cache': cache.stats() if cache else None,
+        'batching': batcher.stats() if batcher else None
+    }
@@ -0,0 +1,79 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class PoolBusy(Exception):
+    """Antrian pool penuh; klien sebaiknya mencoba lagi nanti."""
+
+
+class FaceMeshPool:
+    """Pool thread dengan satu FaceMesh per thread dan antrian berukuran tetap (``PoolBusy`` bila penuh)."""
+
+    def __init__(self, factory, size=1, queue_size=16):
+        self._factory = factory
+        self.size = max(1, int(size))
+        self.queue_size = max(1, int(queue_size))
+        self._tasks = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def started(self):
+        return self._pid == os.getpid()
+
+    def start(self):
+        """Buat instance FaceMesh dan thread pool di proses ini; error inisialisasi dilempar."""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # FaceMesh dibuat di sini agar error inisialisasi sampai ke pemanggil
+            instances = [self._factory() for _ in range(self.size)]
+            self._tasks = queue.Queue(maxsize=self.queue_size)
+            for i, instance in enumerate(instances):
+                threading.Thread(
+                    target=self._worker,
+                    args=(instance,),
+                    name=f"face-mesh-{i}",
+                    daemon=True
+                ).start()
+            self._pid = os.getpid()
+
+    def _worker(self, face_mesh):
+        tasks = self._tasks
+        while True:
+            fn, args, future = tasks.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(face_mesh, *args))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                tasks.task_done()
+
+    def submit(self, fn, *args, wait=False):
+        """Jalankan ``fn(face_mesh, *args)`` di salah satu thread pool.
+
+        Dengan ``wait=True`` pemanggil menunggu tempat di antrian alih-alih
+        menerima ``PoolBusy`` (dipakai untuk warmup, bukan untuk request).
+        """
+        self.start()
+        future = Future()
+        try:
+            self._tasks.put((fn, args, future), block=wait)
+        except queue.Full:
+            raise PoolBusy("Detection queue is full")
+        return future
+
+    def stats(self):
+        started = self.started
+        return {
+            'size': self.size,
+            'queue_size': self.queue_size,
+            'queued': self._tasks.qsize() if started else 0,
+            'started': started
+        }
@@ -0,0 +1,163 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from app.services.features import FEATURE_COLUMNS
+
+
+class FeatureCache:
+    """Cache fitur per frame (kunci BLAKE2b bytes frame): LRU+TTL in-memory, opsional SQLite bersama di ``path``."""
+
+    def __init__(self, max_entries=2048, ttl=600, path=None, namespace=''):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.namespace = namespace.encode()
+        self.width = len(FEATURE_COLUMNS)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+        self.counters = dict.fromkeys(['hits', 'shared_hits', 'misses', 'errors'], 0)
+
+    def key(self, frame):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.namespace)
+        digest.update(frame)
+        return digest.digest()
+
+    def _db(self):
+        # satu koneksi per thread, dibuat ulang di proses hasil fork
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('CREATE TABLE IF NOT EXISTS features '
+                       '(key BLOB PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)')
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def get_many(self, keys):
+        """Fitur yang ada di cache untuk ``keys``: {kunci: baris}."""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] < now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = entry[1]
+        missing = [key for key in set(keys) if key not in found]
+        if self.path and missing:
+            shared = self._shared_get(missing)
+            self._store(shared)
+            found.update(shared)
+            self._count('shared_hits', len(shared))
+        return found
+
+    def put_many(self, rows):
+        self._store(rows)
+        if self.path and rows:
+            self._shared_put(rows)
+
+    def _store(self, rows):
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            for key, row in rows.items():
+                self._entries[key] = (expires, row)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _shared_get(self, keys):
+        try:
+            db = self._db()
+            marks = ','.join('?' * len(keys))
+            cursor = db.execute(f'SELECT key, value FROM features WHERE key IN ({marks}) AND expires > ?',
+                                [*keys, time.time()])
+            return {bytes(key): np.frombuffer(value, np.float64) for key, value in cursor}
+        except sqlite3.Error as e:
+            self._count('errors')
+            print(f"⚠️ Feature cache read failed: {e}")
+            return {}
+
+    def _shared_put(self, rows):
+        now = time.time()
+        try:
+            db = self._db()
+            db.executemany('INSERT OR REPLACE INTO features VALUES (?, ?, ?)',
+                           [(key, row.astype(np.float64).tobytes(), now + self.ttl) for key, row in rows.items()])
+            with self._lock:
+                self._writes += len(rows)
+                prune = self._writes >= self.max_entries // 4 + 1
+                if prune:
+                    self._writes = 0
+            if prune:
+                db.execute('DELETE FROM features WHERE expires <= ?', (now,))
+                db.execute('DELETE FROM features WHERE key IN (SELECT key FROM features '
+                           'ORDER BY expires DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+        except sqlite3.Error as e:
+            self._count('errors')
+            print(f"⚠️ Feature cache write failed: {e}")
+
+    def run(self, run, frames):
+        """Seperti ``run(frames)``, tetapi hanya frame unik yang belum di-cache yang diproses."""
+        keys = [self.key(frame) for frame in frames]
+        found = self.get_many(keys)
+        pending = {}
+        for i, key in enumerate(keys):
+            if key not in found and key not in pending:
+                pending[key] = i
+        self._count('hits', len(frames) - len(pending))
+        self._count('misses', len(pending))
+        if pending:
+            computed = run([frames[i] for i in pending.values()])
+            rows = dict(zip(pending, computed))
+            self.put_many(rows)
+            found.update(rows)
+        matrix = np.empty((len(frames), self.width))
+        for i, key in enumerate(keys):
+            matrix[i] = found[key]
+        return matrix
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            size = len(self._entries)
+        lookups = counters['hits'] + counters['misses']
+        return {
+            **counters,
+            'hit_rate': round(counters['hits'] / lookups, 4) if lookups else None,
+            'size': size,
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'shared': bool(self.path)
+        }
+
+
+def create_feature_cache(config):
+    """Cache fitur sesuai konfigurasi; None bila dimatikan atau mode video (fitur bergantung frame sebelumnya)."""
+    if config.DETECTION_FEATURE_CACHE_SIZE <= 0 or config.DETECTION_MEDIAPIPE_MODE == 'video':
+        return None
+    # crop ROI selalu mati selama cache aktif (lihat landmark_engine.roi_padding)
+    namespace = f"{config.DETECTION_MAX_SIDE}"
+    return FeatureCache(
+        max_entries=config.DETECTION_FEATURE_CACHE_SIZE,
+        ttl=config.DETECTION_FEATURE_CACHE_TTL,
+        path=config.DETECTION_FEATURE_CACHE_PATH or None,
+        namespace=namespace
+    )
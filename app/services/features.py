@@ -0,0 +1,47 @@
+import numpy as np
+
+FEATURE_COLUMNS = ['eyebrow_dist', 'eye_asymmetry', 'mar', 'mouth_asymmetry', 'pucker_asymmetry']
+
+# Landmark MediaPipe yang dipakai fitur, diambil sekaligus dengan fancy indexing
+_LANDMARKS = [55, 285, 159, 145, 33, 133, 386, 374, 362, 263, 13, 14, 61, 291, 78, 308]
+_POS = {idx: pos for pos, idx in enumerate(_LANDMARKS)}
+
+
+def landmarks_to_array(landmarks):
+    """Ubah NormalizedLandmarkList MediaPipe menjadi array (478, 2) berisi (x, y)."""
+    points = landmarks.landmark
+    flat = np.fromiter((c for p in points for c in (p.x, p.y)), dtype=np.float64, count=2 * len(points))
+    return flat.reshape(-1, 2)
+
+def extract_feature_matrix(points):
+    """Hitung kelima FEATURE_COLUMNS untuk setiap frame sekaligus.
+
+    ``points`` berbentuk (N, 478, 2) (atau (478, 2) untuk satu frame);
+    hasilnya array (N, 5) dengan urutan kolom FEATURE_COLUMNS.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 2:
+        points = points[np.newaxis]
+    p = points[:, _LANDMARKS]
+
+    def pt(i):
+        return p[:, _POS[i]]
+
+    def dist(i, j):
+        d = pt(i) - pt(j)
+        return np.sqrt((d * d).sum(axis=-1))
+
+    features = np.empty((len(p), len(FEATURE_COLUMNS)))
+    features[:, 0] = dist(55, 285)
+    features[:, 1] = np.abs(
+        dist(159, 145) / (dist(33, 133) + 1e-8) -
+        dist(386, 374) / (dist(362, 263) + 1e-8)
+    )
+    features[:, 2] = dist(13, 14) / (dist(61, 291) + 1e-8)
+    features[:, 3] = np.abs(pt(61)[:, 1] - pt(291)[:, 1])
+    features[:, 4] = np.abs(pt(78)[:, 0] - pt(308)[:, 0])
+    return features
+
+def valid_rows(features):
+    """Mask baris fitur yang berasal dari frame dengan wajah terdeteksi."""
+    return ~np.isnan(features).any(axis=1)
@@ -0,0 +1,140 @@
+import time
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from app.services.features import extract_feature_matrix, landmarks_to_array
+from app.services.uploads import base64_to_bytes
+
+
+def create_face_mesh(static_image_mode=True):
+    """FaceMesh mode statis (deteksi wajah tiap frame) atau video (tracking antar frame)."""
+    return mp.solutions.face_mesh.FaceMesh(
+        static_image_mode=static_image_mode,
+        max_num_faces=1,
+        refine_landmarks=True,
+        min_detection_confidence=0.5
+    )
+
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_REDUCED_FLAGS = [(8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2)]
+
+def synthetic_frame(width=640, height=480):
+    """Frame JPEG abu-abu polos untuk warmup graph FaceMesh."""
+    return cv2.imencode('.jpg', np.full((height, width, 3), 127, np.uint8))[1].tobytes()
+
+def jpeg_size(buf):
+    """Baca (lebar, tinggi) dari header SOF JPEG tanpa mendecode gambar; None bila bukan JPEG."""
+    data = memoryview(buf)
+    if len(data) < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            i += 2
+            continue
+        if marker in _SOF_MARKERS:
+            return (data[i + 7] << 8) | data[i + 8], (data[i + 5] << 8) | data[i + 6]
+        i += 2 + ((data[i + 2] << 8) | data[i + 3])
+    return None
+
+def decode_image(buf, max_side=None):
+    """Decode frame; dengan ``max_side`` sisi terpanjang diperkecil ke ukuran itu.
+
+    Untuk JPEG besar, libjpeg langsung mendecode pada 1/2, 1/4 atau 1/8
+    resolusi (flag IMREAD_REDUCED_*) selama hasilnya masih >= ``max_side``,
+    lalu sisanya diperkecil dengan INTER_AREA.
+    """
+    try:
+        flag = cv2.IMREAD_COLOR
+        if max_side:
+            size = jpeg_size(buf)
+            if size:
+                flag = next((f for r, f in _REDUCED_FLAGS if max(size) // r >= max_side), flag)
+        img = cv2.imdecode(np.frombuffer(buf, np.uint8), flag)
+        if img is not None and max_side and max(img.shape[:2]) > max_side:
+            scale = max_side / max(img.shape[:2])
+            img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return img
+    except Exception as e:
+        print(f"❌ decode error: {e}")
+        return None
+
+def decode_base64_image(data):
+    buf = base64_to_bytes(data)
+    return None if buf is None else decode_image(buf)
+
+def padded_box(points, padding):
+    """Bounding box landmark (ternormalisasi) yang diperlebar ``padding`` x ukuran wajah."""
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    margin = (hi - lo) * padding
+    return np.clip(lo - margin, 0, 1), np.clip(hi + margin, 0, 1)
+
+def landmarks_in_box(face_mesh, rgb, box):
+    """Jalankan FaceMesh pada potongan ``box`` dan kembalikan landmark dalam koordinat frame penuh."""
+    height, width = rgb.shape[:2]
+    (x0, y0), (x1, y1) = (box[0] * (width, height)).astype(int), np.ceil(box[1] * (width, height)).astype(int)
+    if x1 - x0 < 32 or y1 - y0 < 32:
+        return None
+    result = face_mesh.process(np.ascontiguousarray(rgb[y0:y1, x0:x1]))
+    if not result.multi_face_landmarks:
+        return None
+    points = landmarks_to_array(result.multi_face_landmarks[0])
+    points *= (x1 - x0, y1 - y0)
+    points += (x0, y0)
+    points /= (width, height)
+    return points
+
+def process_frames(face_mesh, frames, reset=False, max_side=None, roi_padding=None, timings=None):
+    """Ubah daftar frame (bytes JPEG/PNG) menjadi matriks fitur (len(frames), 5).
+
+    ``face_mesh`` dipakai eksklusif oleh pemanggil. Baris untuk frame yang
+    gagal didecode atau tanpa wajah berisi NaN, sehingga indeks baris tetap
+    sama dengan indeks frame (lihat ``features.valid_rows``). ``reset``
+    membuang state tracking dari urutan frame sebelumnya (mode video).
+
+    ``max_side`` memperkecil frame sebelum deteksi. Dengan ``roi_padding``,
+    frame berikutnya dipotong ke bounding box wajah frame sebelumnya
+    (diperlebar sebesar padding); bila wajah tidak ditemukan di potongan,
+    frame penuh diproses ulang. ``timings``, bila diberikan, diisi total
+    detik per tahap: decode, convert, landmarks, features.
+    """
+    if reset:
+        face_mesh.reset()
+    clock = time.perf_counter
+    spent = dict.fromkeys(['decode', 'convert', 'landmarks', 'features'], 0.0)
+    points = np.full((len(frames), 478, 2), np.nan)
+    box = None
+    for i, frame in enumerate(frames):
+        t0 = clock()
+        img = decode_image(frame, max_side)
+        t1 = clock()
+        spent['decode'] += t1 - t0
+        if img is None:
+            box = None
+            continue
+        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        t2 = clock()
+        spent['convert'] += t2 - t1
+        found = landmarks_in_box(face_mesh, rgb, box) if box is not None else None
+        if found is None:
+            result = face_mesh.process(rgb)
+            if result.multi_face_landmarks:
+                found = landmarks_to_array(result.multi_face_landmarks[0])
+        spent['landmarks'] += clock() - t2
+        if found is not None:
+            points[i] = found
+        box = padded_box(found, roi_padding) if found is not None and roi_padding is not None else None
+    t3 = clock()
+    features = extract_feature_matrix(points)
+    spent['features'] += clock() - t3
+    if timings is not None:
+        for step, seconds in spent.items():
+            timings[step] = timings.get(step, 0.0) + seconds
+    return features
@@ -0,0 +1,144 @@
+import numpy as np
+
+from app.services.features import FEATURE_COLUMNS
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+def _logistic(x):
+    # sama dengan scipy.special.expit tetapi stabil untuk x besar
+    return np.exp(-np.logaddexp(0, -x), out=x)
+
+def _softmax(x):
+    x -= x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+ACTIVATIONS = {
+    'identity': lambda x: x,
+    'relu': _relu,
+    'logistic': _logistic,
+    'tanh': lambda x: np.tanh(x, out=x),
+    'softmax': _softmax,
+}
+
+
+class NumpyMLP:
+    """StandardScaler + MLPClassifier sebagai operasi matriks NumPy murni.
+
+    Bobot diambil sekali dari objek sklearn saat model dimuat, sehingga
+    inference tidak lagi membuat DataFrame atau melewati validasi sklearn.
+    Input berupa array (N, 5) dengan urutan kolom FEATURE_COLUMNS.
+    """
+
+    def __init__(self, mean, scale, coefs, intercepts, activation, out_activation, classes,
+                 columns=None):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.coefs = [np.asarray(w, dtype=np.float64) for w in coefs]
+        self.intercepts = [np.asarray(b, dtype=np.float64) for b in intercepts]
+        self.activation = activation
+        self.out_activation = out_activation
+        self.classes = np.asarray(classes)
+        # urutan kolom yang diharapkan scaler, relatif terhadap FEATURE_COLUMNS
+        self.columns = None if columns is None else np.asarray(columns)
+
+    @classmethod
+    def from_sklearn(cls, model, scaler):
+        if not hasattr(model, 'coefs_') or not hasattr(scaler, 'scale_'):
+            raise TypeError(f"Unsupported model/scaler: {type(model).__name__}/{type(scaler).__name__}")
+        n = len(FEATURE_COLUMNS)
+        mean = scaler.mean_ if getattr(scaler, 'with_mean', True) and scaler.mean_ is not None else np.zeros(n)
+        scale = scaler.scale_ if getattr(scaler, 'with_std', True) and scaler.scale_ is not None else np.ones(n)
+        columns = None
+        names = getattr(scaler, 'feature_names_in_', None)
+        if names is not None and list(names) != FEATURE_COLUMNS:
+            columns = [FEATURE_COLUMNS.index(name) for name in names]
+        return cls(mean, scale, model.coefs_, model.intercepts_, model.activation,
+                   model.out_activation_, model.classes_, columns)
+
+    def transform(self, features):
+        x = np.asarray(features, dtype=np.float64)
+        if self.columns is not None:
+            x = x[:, self.columns]
+        return (x - self.mean) / self.scale
+
+    def predict_proba(self, features):
+        x = self.transform(features)
+        hidden = ACTIVATIONS[self.activation]
+        last = len(self.coefs) - 1
+        for i, (w, b) in enumerate(zip(self.coefs, self.intercepts)):
+            x = x @ w
+            x += b
+            x = ACTIVATIONS[self.out_activation](x) if i == last else hidden(x)
+        if x.shape[1] == 1:
+            x = np.hstack([1 - x, x])
+        return x
+
+    def predict(self, features):
+        probs = self.predict_proba(features)
+        if probs.shape[1] == 2:
+            # sama dengan LabelBinarizer.inverse_transform sklearn (threshold 0.5)
+            return self.classes[(probs[:, 1] > 0.5).astype(int)]
+        return self.classes[probs.argmax(axis=1)]
+
+
+class SklearnModel:
+    """Cadangan bila model bukan MLP sklearn: jalankan lewat DataFrame seperti sebelumnya."""
+
+    def __init__(self, model, scaler):
+        self.model = model
+        self.scaler = scaler
+
+    def transform(self, features):
+        # pandas hanya dibutuhkan jalur cadangan ini
+        import pandas as pd
+        return self.scaler.transform(pd.DataFrame(features, columns=FEATURE_COLUMNS))
+
+    def predict_proba(self, features):
+        return self.model.predict_proba(self.transform(features))
+
+    def predict(self, features):
+        return self.model.predict(self.transform(features))
+
+
+def build_predictor(model, scaler):
+    try:
+        return NumpyMLP.from_sklearn(model, scaler)
+    except (TypeError, AttributeError) as e:
+        print(f"⚠️ NumPy inference unavailable, using sklearn: {e}")
+        return SklearnModel(model, scaler)
+
+
+def classify(predictor, features, threshold=0.5):
+    """Satu forward pass untuk label dan probabilitas Bell's Palsy per frame.
+
+    Mengembalikan ``(labels, probs)``: ``labels`` bernilai True bila
+    probabilitas frame >= ``threshold``.
+    """
+    probs = predictor.predict_proba(features)[:, 1]
+    return probs >= threshold, probs
+
+def summarize(labels, probs, threshold=0.5):
+    """Ringkasan hasil deteksi dalam format respons predict_bellspalsy."""
+    return summarize_counts(float(probs.mean()), len(labels), int(np.count_nonzero(labels)), threshold)
+
+def summarize_counts(avg_prob, total_frames, positive_frames, threshold=0.5):
+    """Seperti ``summarize`` tetapi dari agregat, untuk sesi yang tidak menyimpan semua frame."""
+    is_positive = avg_prob >= threshold
+    return {
+        'is_positive': is_positive,
+        'prediction': "Bell's Palsy" if is_positive else "Normal",
+        'confidence': avg_prob,
+        'confidence_level': "Tinggi" if avg_prob > 0.7 or avg_prob < 0.3 else "Sedang",
+        'percentage': round(avg_prob * 100, 1),
+        'total_frames': total_frames,
+        'bellspalsy_frames': positive_frames,
+        'normal_frames': total_frames - positive_frames,
+        'probabilities': {
+            'normal': float(1 - avg_prob),
+            'bells_palsy': avg_prob
+        }
+    }
@@ -0,0 +1,194 @@
+import multiprocessing
+import os
+import threading
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from app.services.face_mesh_pool import FaceMeshPool, PoolBusy
+from app.services.frames import create_face_mesh, process_frames
+
+
+class ThreadEngine:
+    """Backend default: satu request diproses oleh satu thread FaceMeshPool.
+
+    Dengan ``static=False`` FaceMesh berjalan dalam mode video: frame satu
+    request diperlakukan sebagai satu urutan dan tracking di-reset di awal
+    setiap request.
+    """
+
+    name = 'thread'
+
+    def __init__(self, size=1, queue_size=16, static=True, process=process_frames):
+        self.static = static
+        self.process = process
+        self.pool = FaceMeshPool(partial(create_face_mesh, static), size=size, queue_size=queue_size)
+
+    @property
+    def started(self):
+        return self.pool.started
+
+    def start(self):
+        """Buat semua FaceMesh pool sekarang, bukan saat request pertama."""
+        self.pool.start()
+
+    def run(self, frames):
+        return self.pool.submit(self.process, frames, not self.static).result()
+
+    def warmup(self, frames):
+        """Proses ``frames`` sekali di setiap thread agar semua graph FaceMesh terinisialisasi."""
+        barrier = threading.Barrier(self.pool.size)
+
+        def task(face_mesh, frames, reset):
+            # menahan setiap thread sampai semua thread mendapat satu task
+            barrier.wait(timeout=120)
+            return self.process(face_mesh, frames, reset)
+
+        futures = [self.pool.submit(task, frames, not self.static, wait=True) for _ in range(self.pool.size)]
+        return [f.result() for f in futures][0]
+
+    def stats(self):
+        return dict(self.pool.stats(), backend=self.name, static=self.static)
+
+
+# State milik proses worker ProcessEngine
+_worker_face_mesh = None
+_worker_static = True
+_worker_process = process_frames
+
+def _init_worker(static=True, process=process_frames):
+    global _worker_face_mesh, _worker_static, _worker_process
+    _worker_face_mesh = create_face_mesh(static)
+    _worker_static = static
+    _worker_process = process
+
+def _process_chunk(frames):
+    return _worker_process(_worker_face_mesh, frames, not _worker_static)
+
+
+class ProcessEngine:
+    """Backend multiprocessing: frame satu request dibagi ke beberapa proses.
+
+    Setiap proses worker membuat FaceMesh sekali saat start. Frame dipotong
+    menjadi potongan berurutan, satu per worker, dan hasilnya digabung lagi
+    sesuai urutan frame; pada mode video setiap potongan di-track sebagai
+    urutan tersendiri. Jumlah request yang boleh berjalan bersamaan
+    dibatasi ``max_pending``; selebihnya ditolak dengan ``PoolBusy``.
+    """
+
+    name = 'process'
+
+    def __init__(self, workers=None, max_pending=16, start_method='spawn', static=True,
+                 process=process_frames):
+        self.static = static
+        self.process = process
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.max_pending = max(1, int(max_pending))
+        self.start_method = start_method
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._probe_pid = None
+
+    @property
+    def started(self):
+        return os.getpid() in (self._pid, self._probe_pid)
+
+    def start(self):
+        """Coba buat satu FaceMesh di proses ini agar error MediaPipe muncul sebelum proses worker dibuat."""
+        create_face_mesh(self.static).close()
+        self._probe_pid = os.getpid()
+
+    def _get_executor(self):
+        if self._pid != os.getpid() or self._executor is None:
+            with self._lock:
+                if self._pid != os.getpid():
+                    # executor milik proses induk tidak bisa dipakai setelah fork
+                    self._executor = None
+                    self._slots = threading.BoundedSemaphore(self.max_pending)
+                    self._pid = os.getpid()
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                        initializer=_init_worker,
+                        initargs=(self.static, self.process)
+                    )
+        return self._executor
+
+    def _discard(self, executor):
+        """Buang executor yang rusak (worker mati, mis. OOM); executor baru dibuat saat dipakai lagi."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _map(self, chunks):
+        executor = self._get_executor()
+        try:
+            return list(executor.map(_process_chunk, chunks))
+        except BrokenProcessPool:
+            print("⚠️ Detection process pool broken, restarting workers")
+            self._discard(executor)
+            return list(self._get_executor().map(_process_chunk, chunks))
+
+    def run(self, frames):
+        self._get_executor()
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PoolBusy("Detection queue is full")
+        try:
+            size = -(-len(frames) // self.workers)
+            chunks = [frames[i:i + size] for i in range(0, len(frames), size)]
+            return np.vstack(self._map(chunks))
+        finally:
+            slots.release()
+
+    def warmup(self, frames):
+        """Kirim ``frames`` ke setiap proses worker sehingga semuanya sudah start."""
+        return self._map([frames] * self.workers)[0]
+
+    def stats(self):
+        return {
+            'backend': self.name,
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'static': self.static,
+            'started': self.started
+        }
+
+
+def roi_padding(config):
+    """Padding crop ROI, atau None bila crop mati, cache fitur aktif, atau mode video."""
+    cached = config.DETECTION_FEATURE_CACHE_SIZE > 0
+    if not config.DETECTION_ROI_CROP or config.DETECTION_MEDIAPIPE_MODE == 'video' or cached:
+        return None
+    return config.DETECTION_ROI_PADDING
+
+def frame_processor(config):
+    """``process_frames`` dengan opsi preprocessing dari konfigurasi."""
+    return partial(
+        process_frames,
+        max_side=config.DETECTION_MAX_SIDE or None,
+        roi_padding=roi_padding(config)
+    )
+
+def create_engine(config):
+    static = config.DETECTION_MEDIAPIPE_MODE != 'video'
+    if config.DETECTION_BACKEND == ProcessEngine.name:
+        return ProcessEngine(
+            workers=config.DETECTION_PROCESS_WORKERS,
+            max_pending=config.FACE_MESH_QUEUE_SIZE,
+            start_method=config.DETECTION_PROCESS_START_METHOD,
+            static=static,
+            process=frame_processor(config)
+        )
+    return ThreadEngine(
+        size=config.FACE_MESH_POOL_SIZE,
+        queue_size=config.FACE_MESH_QUEUE_SIZE,
+        static=static,
+        process=frame_processor(config)
+    )
@@ -0,0 +1,90 @@
+"""Format model ``.npz`` tanpa pickle untuk scaler + MLP.
+
+File berisi array mean/scale scaler, bobot dan bias tiap layer MLP, kelas,
+serta metadata JSON (aktivasi, kolom fitur) yang disimpan sebagai bytes.
+Arsip ditulis tanpa kompresi sehingga setiap array bisa di-memory-map:
+memuatnya hanya membaca header, dan halaman bobot dibagi lewat page cache
+oleh semua proses worker yang memuat file yang sama.
+"""
+import json
+import struct
+import zipfile
+
+import numpy as np
+
+from app.services.features import FEATURE_COLUMNS
+from app.services.inference import NumpyMLP
+
+FORMAT_VERSION = 1
+
+
+def export_npz(predictor, path):
+    """Tulis ``NumpyMLP`` ke ``path`` (.npz tanpa kompresi)."""
+    meta = {
+        'format': FORMAT_VERSION,
+        'activation': predictor.activation,
+        'out_activation': predictor.out_activation,
+        'feature_columns': FEATURE_COLUMNS,
+        'layers': len(predictor.coefs),
+    }
+    arrays = {
+        'meta': np.frombuffer(json.dumps(meta).encode(), np.uint8),
+        'mean': predictor.mean,
+        'scale': predictor.scale,
+        'classes': predictor.classes,
+    }
+    if predictor.columns is not None:
+        arrays['columns'] = predictor.columns
+    for i, (w, b) in enumerate(zip(predictor.coefs, predictor.intercepts)):
+        arrays[f'coef_{i}'] = w
+        arrays[f'intercept_{i}'] = b
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+def _mapped_arrays(path):
+    """Memory-map setiap member .npy di arsip .npz tanpa kompresi."""
+    with zipfile.ZipFile(path) as zf:
+        infos = zf.infolist()
+    arrays = {}
+    with open(path, 'rb') as f:
+        for info in infos:
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} is compressed and cannot be memory-mapped")
+            f.seek(info.header_offset)
+            name_len, extra_len = struct.unpack('<HH', f.read(30)[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"{info.filename} contains Python objects")
+            name = info.filename[:-len('.npy')]
+            arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                     order='F' if fortran else 'C')
+    return arrays
+
+def load_npz(path, mmap=True):
+    """Bangun ``NumpyMLP`` dari file hasil ``export_npz``."""
+    if mmap:
+        arrays = _mapped_arrays(path)
+    else:
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+    meta = json.loads(bytes(arrays['meta']).decode())
+    if meta.get('format') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model format {meta.get('format')}")
+    if meta['feature_columns'] != FEATURE_COLUMNS:
+        raise ValueError(f"Model expects features {meta['feature_columns']}, not {FEATURE_COLUMNS}")
+    layers = meta['layers']
+    return NumpyMLP(
+        arrays['mean'],
+        arrays['scale'],
+        [arrays[f'coef_{i}'] for i in range(layers)],
+        [arrays[f'intercept_{i}'] for i in range(layers)],
+        meta['activation'],
+        meta['out_activation'],
+        np.asarray(arrays['classes']),
+        arrays.get('columns')
+    )
@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from datetime import datetime, timezone
+
+ML_DIR = os.path.join('app', 'ml')
+MANIFEST = 'manifest.json'
+
+
+def load_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def load_feature_columns(path):
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip() and line.strip() != 'label']
+
+def load_npz(path):
+    from app.services.model_format import load_npz
+    return load_npz(path)
+
+def build_predictor(get):
+    """Predictor NumPy: dari model.npz bila ada, selain itu dari pickle sklearn."""
+    # diimpor di sini agar registry tidak menarik NumPy/pandas saat diimpor
+    from app.services.features import FEATURE_COLUMNS
+    from app.services.inference import build_predictor
+    columns = get('feature_columns')
+    if columns is not None and columns != FEATURE_COLUMNS:
+        raise ValueError(f"feature_columns.txt {columns} does not match {FEATURE_COLUMNS}")
+    predictor = get('npz')
+    if predictor is None:
+        model, scaler = get('mlp'), get('scaler')
+        if model is None or scaler is None:
+            raise FileNotFoundError("No model.npz or model_mlp.pkl + scaler.pkl in this model version")
+        predictor = build_predictor(model, scaler)
+    return predictor
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def utc_now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class ArtifactStore:
+    """Artefak model berversi di ``versions/<versi>/`` dengan manifest checksum; versi aktif di file CURRENT."""
+
+    def __init__(self, base_dir=ML_DIR):
+        self.base_dir = base_dir
+        self.versions_dir = os.path.join(base_dir, 'versions')
+        self.current_file = os.path.join(base_dir, 'CURRENT')
+
+    def current_version(self):
+        try:
+            with open(self.current_file) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self):
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(v for v in os.listdir(self.versions_dir)
+                      if os.path.isfile(os.path.join(self.versions_dir, v, MANIFEST)))
+
+    def path(self, version):
+        return self.base_dir if version is None else os.path.join(self.versions_dir, version)
+
+    def check(self, version):
+        """ValueError bila ``version`` bukan versi yang sudah diterbitkan (``None`` = legacy)."""
+        if version is not None and version not in self.list_versions():
+            raise ValueError(f"Unknown model version {version}")
+
+    def manifest(self, version):
+        if version is None:
+            return None
+        with open(os.path.join(self.path(version), MANIFEST)) as f:
+            return json.load(f)
+
+    def verify(self, version):
+        """Cocokkan checksum file versi dengan manifest-nya; ValueError bila berbeda."""
+        manifest = self.manifest(version)
+        if manifest is None:
+            return
+        for filename, expected in manifest['files'].items():
+            actual = file_checksum(os.path.join(self.path(version), filename))
+            if actual != expected:
+                raise ValueError(f"Checksum mismatch for {version}/{filename}")
+
+    def publish(self, version, files, activate=False):
+        """Salin ``files`` ({nama tujuan: path sumber}) menjadi versi baru beserta manifest."""
+        if not version or version in ('.', '..') or os.path.basename(version) != version:
+            raise ValueError(f"Invalid model version name {version!r}")
+        target = self.path(version)
+        if os.path.exists(target):
+            raise ValueError(f"Model version {version} already exists")
+        os.makedirs(target)
+        checksums = {}
+        for filename, source in files.items():
+            with open(source, 'rb') as src, open(os.path.join(target, filename), 'wb') as dst:
+                for block in iter(lambda: src.read(1 << 20), b''):
+                    dst.write(block)
+            checksums[filename] = file_checksum(os.path.join(target, filename))
+        with open(os.path.join(target, MANIFEST), 'w') as f:
+            json.dump({'version': version, 'created_at': utc_now(), 'files': checksums}, f, indent=2)
+        if activate:
+            self.activate(version)
+
+    def activate(self, version):
+        if version is None:
+            raise ValueError("Unknown model version None")
+        self.check(version)
+        tmp = f"{self.current_file}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(version + '\n')
+        os.replace(tmp, self.current_file)
+
+
+class ModelBundle:
+    """Satu versi model; artefak ``lazy`` baru dimuat saat pertama diminta."""
+
+    def __init__(self, version, values, meta, lazy=None):
+        self.version = version
+        self.values = values
+        self.meta = meta
+        self._lazy = lazy or {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        if name not in self.values and name in self._lazy:
+            with self._lock:
+                if name not in self.values:
+                    self.values[name] = self._lazy[name]()
+        return self.values[name]
+
+
+class ModelRegistry:
+    """Artefak model per proses; ``reload`` memuat versi baru sepenuhnya lalu menukar bundle sekaligus."""
+
+    def __init__(self, store):
+        self.store = store
+        self._files = {}
+        self._derived = {}
+        self._bundle = None
+        self._lock = threading.Lock()
+        self._watch_pid = None
+
+    def register(self, name, filename, loader=load_pickle, optional=False, lazy=False):
+        self._files[name] = (filename, loader, optional, lazy)
+
+    def derive(self, name, builder):
+        """``builder(get)`` membangun artefak dari artefak lain lewat ``get(nama)``."""
+        self._derived[name] = builder
+
+    def load_bundle(self, version=None):
+        self.store.check(version)
+        self.store.verify(version)
+        directory = self.store.path(version)
+        values, lazy, files = {}, {}, {}
+        for name, (filename, loader, optional, is_lazy) in self._files.items():
+            path = os.path.join(directory, filename)
+            if not os.path.exists(path):
+                if not optional:
+                    raise FileNotFoundError(path)
+                values[name] = None
+                continue
+            if is_lazy:
+                lazy[name] = lambda loader=loader, path=path: loader(path)
+            else:
+                values[name] = loader(path)
+            stat = os.stat(path)
+            files[name] = {
+                'path': path,
+                'sha256': file_checksum(path)[:12],
+                'size': stat.st_size,
+                'modified_at': datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat()
+            }
+        key = 'npz' if 'npz' in files else 'mlp'
+        if version is None:
+            version = 'legacy-' + files[key]['sha256'] if key in files else 'legacy'
+        bundle = ModelBundle(version, values, {'loaded_at': utc_now(), 'files': files}, lazy)
+        for name, builder in self._derived.items():
+            values[name] = builder(bundle.__getitem__)
+        return bundle
+
+    def bundle(self):
+        """Bundle aktif; pegang referensinya selama satu request agar versinya konsisten."""
+        bundle = self._bundle
+        if bundle is None:
+            with self._lock:
+                if self._bundle is None:
+                    self._bundle = self.load_bundle(self.store.current_version())
+                bundle = self._bundle
+        return bundle
+
+    def get(self, name):
+        return self.bundle()[name]
+
+    def loaded(self, name):
+        bundle = self._bundle
+        return bundle is not None and bundle.values.get(name) is not None
+
+    def reload(self, version=None):
+        """Muat versi (default: isi CURRENT) lalu jadikan aktif; bundle lama tetap utuh bila gagal."""
+        bundle = self.load_bundle(version or self.store.current_version())
+        self._bundle = bundle
+        print(f"✅ Model version {bundle.version} active.")
+        return self.metadata()
+
+    def reload_async(self, version=None, activate=False):
+        """``reload`` di background; dengan ``activate`` CURRENT baru ditulis setelah versi berhasil dimuat."""
+        self.store.check(version)
+
+        def run():
+            try:
+                self.reload(version)
+                if activate:
+                    self.store.activate(version)
+                    print(f"✅ {version} is now CURRENT")
+            except Exception as e:
+                print(f"❌ Error reloading model {version or ''}: {e}")
+        thread = threading.Thread(target=run, name='model-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def watch(self, interval):
+        """Pantau CURRENT dan muat ulang bila isinya berubah (satu thread per proses)."""
+        if not interval or self._watch_pid == os.getpid():
+            return
+        self._watch_pid = os.getpid()
+
+        def run():
+            # bandingkan dengan isi CURRENT terakhir, bukan versi aktif: reload admin tanpa activate tetap dipakai
+            seen = self.store.current_version()
+            while True:
+                time.sleep(interval)
+                wanted = self.store.current_version()
+                if wanted and wanted != seen:
+                    seen = wanted
+                    try:
+                        self.reload(wanted)
+                    except Exception as e:
+                        print(f"❌ Error reloading model {wanted}: {e}")
+
+        threading.Thread(target=run, name='model-watch', daemon=True).start()
+
+    def metadata(self):
+        bundle = self._bundle
+        if bundle is None:
+            return {'version': None}
+        return {'version': bundle.version, **bundle.meta}
+
+
+registry = ModelRegistry(ArtifactStore())
+# pickle sklearn hanya dimuat bila diminta (MLController, atau versi tanpa model.npz)
+registry.register('mlp', 'model_mlp.pkl', optional=True, lazy=True)
+registry.register('scaler', 'scaler.pkl', optional=True, lazy=True)
+registry.register('npz', 'model.npz', load_npz, optional=True)
+registry.register('feature_columns', 'feature_columns.txt', load_feature_columns, optional=True)
+registry.derive('predictor', build_predictor)
@@ -0,0 +1,115 @@
+import base64
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from mongoengine.queryset.visitor import Q
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _to_millis(value):
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // timedelta(milliseconds=1)
+
+def encode_cursor(value, object_id):
+    """Cursor opaque untuk posisi (waktu, _id) dokumen terakhir satu halaman."""
+    raw = json.dumps({'t': _to_millis(value), 'id': str(object_id)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Kebalikan ``encode_cursor``: (datetime UTC naif, ObjectId); ValueError bila tidak valid."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return EPOCH + timedelta(milliseconds=int(data['t'])), ObjectId(data['id'])
+    except (ValueError, TypeError, KeyError, InvalidId) as e:
+        raise ValueError('Invalid cursor') from e
+
+def after_cursor(field, cursor):
+    """Filter dokumen setelah ``cursor`` untuk urutan (-``field``, -_id)."""
+    value, object_id = decode_cursor(cursor)
+    return Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__lt': object_id})
+
+def page_limit(value, default, maximum):
+    """``limit`` dari query string, dibatasi 1..``maximum``; ValueError bila bukan angka."""
+    if value in (None, ''):
+        return default
+    try:
+        return min(max(int(value), 1), maximum)
+    except ValueError:
+        raise ValueError('Invalid limit') from None
+
+class CursorPage:
+    """Satu halaman ``queryset`` dengan urutan (-``field``, -_id) setelah ``cursor``.
+
+    Iterasi langsung membaca cursor Mongo (tanpa menampung satu halaman di
+    list), sehingga bisa dipakai ``stream_json``. ``has_next`` dan
+    ``next_cursor`` terisi setelah iterasi selesai. ``queryset`` boleh
+    ``as_pymongo()``, sehingga baris berupa dict mentah tanpa membangun
+    Document. ValueError bila ``cursor`` tidak valid.
+    """
+
+    def __init__(self, queryset, field, cursor, limit):
+        if cursor:
+            queryset = queryset.filter(after_cursor(field, cursor))
+        self.field = field
+        self.limit = limit
+        # satu dokumen ekstra untuk mengetahui has_next
+        self.queryset = queryset.order_by(f'-{field}', '-id').limit(limit + 1)
+        self.has_next = False
+        self.last = None
+
+    def __iter__(self):
+        for i, row in enumerate(self.queryset):
+            if i == self.limit:
+                self.has_next = True
+                break
+            self.last = row
+            yield row
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return None
+        if isinstance(self.last, dict):
+            return encode_cursor(self.last[self.field], self.last['_id'])
+        return encode_cursor(getattr(self.last, self.field), self.last.id)
+
+
+def cursor_page(queryset, field, cursor, limit):
+    """``CursorPage`` yang langsung dibaca; kembalikan ``(rows, next_cursor)``."""
+    page = CursorPage(queryset, field, cursor, limit)
+    rows = list(page)
+    return rows, page.next_cursor
+
+class CountCache:
+    """Cache hasil ``count()`` per query selama ``ttl`` detik.
+
+    Total dokumen hanya informatif untuk pagination, jadi boleh sedikit
+    terlambat; dengan cache, tiap halaman tidak perlu menghitung ulang
+    seluruh collection.
+    """
+
+    def __init__(self, ttl=30, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, count):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+        value = count()
+        with self._lock:
+            if len(self._counts) >= self.max_entries:
+                self._counts = {k: v for k, v in self._counts.items() if v[0] > now}
+            if len(self._counts) < self.max_entries:
+                self._counts[key] = (now + self.ttl, value)
+        return value
@@ -0,0 +1,51 @@
+import numpy as np
+
+from app.services.features import valid_rows
+
+
+def spread_order(n):
+    """Urutan indeks 0..n-1 yang menyebar rata di sepanjang klip (bit-reversal).
+
+    Contoh untuk n=8: 0, 4, 2, 6, 1, 5, 3, 7, sehingga beberapa frame
+    pertama yang diproses sudah mewakili awal, tengah dan akhir klip.
+    """
+    bits = max(1, (n - 1).bit_length())
+    order = []
+    for i in range(1 << bits):
+        j = int(format(i, f'0{bits}b')[::-1], 2)
+        if j < n:
+            order.append(j)
+    return order
+
+def settled(probs, threshold, z):
+    """True bila interval kepercayaan rata-rata probabilitas tidak memuat ``threshold``."""
+    if len(probs) < 2:
+        return False
+    half_width = z * probs.std(ddof=1) / np.sqrt(len(probs))
+    mean = probs.mean()
+    return mean - half_width > threshold or mean + half_width < threshold
+
+def run_adaptive(run, score, frames, threshold, z=2.58, min_frames=6, batch_size=4):
+    """Proses frame bertahap dalam ``spread_order`` dan berhenti begitu hasilnya pasti.
+
+    ``run`` memetakan daftar frame ke matriks fitur (seperti ``engine.run``)
+    dan ``score`` memetakan fitur ke probabilitas positif per frame. Berhenti
+    setelah minimal ``min_frames`` frame berwajah bila ``settled`` terpenuhi.
+    Mengembalikan ``(fitur frame berwajah, jumlah frame yang diproses)``.
+
+    Frame satu klip saling berkorelasi, jadi interval ini heuristik; ``z``
+    yang besar (default 2.58, ~99%) menjaga agar kasus di sekitar threshold
+    tetap memakai semua frame.
+    """
+    order = spread_order(len(frames))
+    found = np.empty((0, 0))
+    used = 0
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        features = run([frames[i] for i in batch])
+        used += len(batch)
+        features = features[valid_rows(features)]
+        found = features if found.size == 0 else np.vstack([found, features])
+        if len(found) >= min_frames and settled(score(found), threshold, z):
+            break
+    return found, used
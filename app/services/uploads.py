@@ -0,0 +1,47 @@
+import base64
+import struct
+
+
+class FrameLimit(ValueError):
+    """Request melewati batas jumlah atau ukuran frame (HTTP 413)."""
+
+
+def base64_to_bytes(data):
+    """Data-URL / string base64 menjadi bytes JPEG, atau None bila rusak."""
+    try:
+        if ',' in data: data = data.split(',')[1]
+        if len(data) % 4: data += '=' * (4 - len(data) % 4)
+        return base64.b64decode(data)
+    except Exception as e:
+        print(f"❌ decode error: {e}")
+        return None
+
+def read_length_prefixed(stream, max_frames, max_frame_bytes):
+    """Baca frame dari stream biner ``[uint32 big-endian panjang][bytes JPEG]...``.
+
+    Melempar ValueError bila stream terpotong, FrameLimit bila melewati batas.
+    """
+    frames = []
+    while True:
+        header = stream.read(4)
+        if not header:
+            return frames
+        if len(header) < 4:
+            raise ValueError("Truncated frame header")
+        (size,) = struct.unpack('>I', header)
+        if size > max_frame_bytes:
+            raise FrameLimit(f"Frame larger than {max_frame_bytes} bytes")
+        if len(frames) >= max_frames:
+            raise FrameLimit(f"More than {max_frames} frames")
+        buf = stream.read(size)
+        if len(buf) < size:
+            raise ValueError("Truncated frame body")
+        frames.append(buf)
+
+def check_frames(frames, max_frames, max_frame_bytes=None):
+    """FrameLimit bila jumlah ``frames`` (atau ukuran salah satunya) melewati batas."""
+    if len(frames) > max_frames:
+        raise FrameLimit(f"More than {max_frames} frames")
+    if max_frame_bytes is not None and any(len(frame) > max_frame_bytes for frame in frames):
+        raise FrameLimit(f"Frame larger than {max_frame_bytes} bytes")
+    return frames
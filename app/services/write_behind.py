@@ -0,0 +1,224 @@
+import atexit
+import contextlib
+import glob
+import os
+import threading
+import time
+
+import pymongo
+from bson import ObjectId, json_util
+from mongoengine.connection import get_db
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from config import Config
+
+DUPLICATE_KEY = 11000
+
+
+class WriteBehindBuffer:
+    """Insert/``$set`` Mongo yang diantrekan lalu dikirim dengan ``bulk_write``; gagal kirim masuk file spill per proses."""
+
+    def __init__(self, max_batch=100, interval=1.0, spill_path=None, enabled=True, final_timeout=2.0):
+        self.max_batch = max_batch
+        self.interval = interval
+        self.final_timeout = final_timeout
+        self.spill_path = spill_path
+        self.enabled = enabled
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None
+        self._healthy = True
+        self.counters = dict.fromkeys(['queued', 'written', 'flushes', 'spilled', 'replayed', 'dropped'], 0)
+
+    def _ensure_started(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    threading.Thread(target=self._loop, name='write-behind', daemon=True).start()
+                    atexit.register(self.flush, final=True)
+                    self._pid = os.getpid()
+
+    def _add(self, op):
+        self._ensure_started()
+        with self._lock:
+            self._pending.append(op)
+            self.counters['queued'] += 1
+            full = len(self._pending) >= self.max_batch
+        if full:
+            self._wakeup.set()
+
+    def insert(self, document):
+        """Antrekan insert dokumen mongoengine; kembalikan id yang sudah dibuat."""
+        document.validate()
+        if document.pk is None:
+            document.pk = ObjectId()
+        if not self.enabled:
+            document.save(force_insert=True)
+        else:
+            self._add({'c': document._get_collection_name(), 'insert': document.to_mongo().to_dict()})
+        return document.pk
+
+    def update(self, document, **fields):
+        """Antrekan ``$set`` field dokumen yang sudah ada, seperti ``document.update(field=nilai)``."""
+        if not self.enabled:
+            document.update(**fields)
+            return
+        values = {document._fields[name].db_field: document._fields[name].to_mongo(value)
+                  for name, value in fields.items()}
+        self._add({'c': document._get_collection_name(), 'filter': {'_id': document.pk}, 'set': values})
+
+    def _loop(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Write-behind flush failed: {e}")
+
+    def flush(self, final=False):
+        """Kirim semua operasi yang tertunda (termasuk isi file spill); kembalikan jumlah yang tertulis.
+
+        Dengan ``final`` dan Mongo sedang tidak tersedia, antrean langsung
+        ditulis ke file spill agar shutdown tidak menunggu timeout koneksi;
+        selain itu setiap ``bulk_write`` dibatasi ``final_timeout``.
+        """
+        with self._flush_lock:
+            with self._lock:
+                ops, self._pending = self._pending, []
+            try:
+                return self._write(ops, final)
+            except Exception:
+                # kembalikan ke antrean; file replay yang sudah diklaim tetap di disk untuk flush berikutnya
+                with self._lock:
+                    self._pending[:0] = ops
+                raise
+
+    def _write(self, ops, final):
+        if final and not self._healthy:
+            self._spill(ops)
+            return 0
+
+        claimed, replayed = self._claim_spill()
+        ops = replayed + ops
+        if not ops:
+            return 0
+
+        groups = {}
+        for op in ops:
+            groups.setdefault(op['c'], []).append(op)
+        written, failed = 0, []
+        for collection, group in groups.items():
+            try:
+                with pymongo.timeout(self.final_timeout) if final else contextlib.nullcontext():
+                    get_db()[collection].bulk_write([self._request(op) for op in group], ordered=False)
+                written += len(group)
+            except BulkWriteError as e:
+                errors = [err for err in e.details['writeErrors'] if err['code'] != DUPLICATE_KEY]
+                for err in errors:
+                    print(f"❌ Write-behind dropped {collection} write: {err['errmsg']}")
+                written += len(group) - len(errors)
+                with self._lock:
+                    self.counters['dropped'] += len(errors)
+            except PyMongoError as e:
+                print(f"⚠️ MongoDB unavailable, spilling {len(group)} {collection} writes: {e}")
+                failed += group
+            except Exception as e:
+                print(f"❌ Write-behind flush of {collection} failed, spilling {len(group)} writes: {e}")
+                failed += group
+
+        self._healthy = not failed
+        self._spill(failed)
+        for path in claimed:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self.counters['written'] += written
+            self.counters['flushes'] += 1
+            self.counters['replayed'] += len(replayed)
+        return written
+
+    @staticmethod
+    def _request(op):
+        if 'insert' in op:
+            return InsertOne(op['insert'])
+        return UpdateOne(op['filter'], {'$set': op['set']})
+
+    def _spill_file(self):
+        # satu file per proses: file yang sedang di-append tidak pernah diklaim worker lain
+        return f"{self.spill_path}.{os.getpid()}"
+
+    def _claim_spill(self):
+        """Ambil alih file spill/replay milik proses ini atau proses yang sudah mati; kembalikan (path, operasi)."""
+        if not self.spill_path:
+            return [], []
+        claimed, ops = [], []
+        # spill_path tanpa PID berasal dari versi lama
+        owned = [path for path in glob.glob(f"{self.spill_path}.*") if self._orphaned(path)]
+        for path in [self.spill_path, *owned]:
+            target = f"{self.spill_path}.{os.getpid()}-{time.time_ns()}.replay"
+            try:
+                os.replace(path, target)
+            except FileNotFoundError:
+                continue
+            with open(target) as f:
+                ops += [json_util.loads(line) for line in f if line.strip()]
+            claimed.append(target)
+        return claimed, ops
+
+    def _orphaned(self, path):
+        """True bila file spill/replay milik proses ini (dipanggil di bawah ``_flush_lock``) atau proses yang sudah mati."""
+        try:
+            pid = int(path[len(self.spill_path) + 1:].split('-', 1)[0])
+        except ValueError:
+            return False
+        if pid == os.getpid():
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def _spill(self, ops):
+        if not ops:
+            return
+        if not self.spill_path:
+            print(f"❌ Write-behind lost {len(ops)} writes (no spill file configured)")
+            with self._lock:
+                self.counters['dropped'] += len(ops)
+            return
+        with open(self._spill_file(), 'a') as f:
+            f.write(''.join(json_util.dumps(op) + '\n' for op in ops))
+            f.flush()
+            os.fsync(f.fileno())
+        with self._lock:
+            self.counters['spilled'] += len(ops)
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+            counters = dict(self.counters)
+        return {
+            **counters,
+            'enabled': self.enabled,
+            'pending': pending,
+            'healthy': self._healthy,
+            'spill_pending': bool(self.spill_path) and bool(glob.glob(f"{self.spill_path}*"))
+        }
+
+
+writes = WriteBehindBuffer(
+    max_batch=Config.WRITE_BEHIND_BATCH,
+    interval=Config.WRITE_BEHIND_INTERVAL,
+    spill_path=Config.WRITE_BEHIND_SPILL_PATH or None,
+    enabled=Config.WRITE_BEHIND_ENABLED,
+    final_timeout=Config.WRITE_BEHIND_FINAL_TIMEOUT
+)
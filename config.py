@@ -5,6 +5,72 @@ load_dotenv()
 
 class Config(object):
     MONGO_URI = os.environ.get("MONGO_URI")
+    MONGO_DB = os.environ.get("DB_DATABASE")
+    # Pool koneksi MongoDB bersama (per proses worker), lihat app/db.py
+    MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", 20))
+    MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_MAX_IDLE_MS = int(os.environ.get("MONGO_MAX_IDLE_MS", 300000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 10000))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get("MONGO_CONNECT_TIMEOUT_MS", 10000))
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET')
     MAIL_USERNAME = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
+
+    # Deteksi Bell's Palsy
+    FACE_MESH_POOL_SIZE = int(os.environ.get("FACE_MESH_POOL_SIZE", os.cpu_count() or 1))
+    FACE_MESH_QUEUE_SIZE = int(os.environ.get("FACE_MESH_QUEUE_SIZE", 16))
+    DETECTION_RETRY_AFTER = int(os.environ.get("DETECTION_RETRY_AFTER", 2))
+    # "thread" (FaceMeshPool) atau "process" (ProcessPoolExecutor)
+    DETECTION_BACKEND = os.environ.get("DETECTION_BACKEND", "thread")
+    DETECTION_PROCESS_WORKERS = int(os.environ.get("DETECTION_PROCESS_WORKERS", os.cpu_count() or 1))
+    DETECTION_PROCESS_START_METHOD = os.environ.get("DETECTION_PROCESS_START_METHOD", "spawn")
+    DETECTION_THRESHOLD = float(os.environ.get("DETECTION_THRESHOLD", 0.5))
+    DETECTION_MAX_FRAMES = int(os.environ.get("DETECTION_MAX_FRAMES", 120))
+    DETECTION_MAX_FRAME_BYTES = int(os.environ.get("DETECTION_MAX_FRAME_BYTES", 8 * 1024 * 1024))
+    DETECTION_SESSION_TTL = int(os.environ.get("DETECTION_SESSION_TTL", 120))
+    DETECTION_SESSION_LIMIT = int(os.environ.get("DETECTION_SESSION_LIMIT", 256))
+    DETECTION_SESSION_MAX_FRAMES = int(os.environ.get("DETECTION_SESSION_MAX_FRAMES", 600))
+    # FaceMesh tracking sesi yang boleh hidup bersamaan (mode video); sisanya 503 + Retry-After
+    DETECTION_SESSION_TRACKERS = int(os.environ.get("DETECTION_SESSION_TRACKERS", FACE_MESH_POOL_SIZE))
+    # "static" (deteksi wajah tiap frame) atau "video" (tracking FaceMesh per request/sesi)
+    DETECTION_MEDIAPIPE_MODE = os.environ.get("DETECTION_MEDIAPIPE_MODE", "static")
+    # Preprocessing frame: sisi terpanjang maksimum (0 = resolusi asli) dan crop ROI wajah
+    # (crop hanya dipakai pada mode static dengan DETECTION_FEATURE_CACHE_SIZE=0)
+    DETECTION_MAX_SIDE = int(os.environ.get("DETECTION_MAX_SIDE", 640))
+    DETECTION_ROI_CROP = os.environ.get("DETECTION_ROI_CROP", "false").lower() == "true"
+    DETECTION_ROI_PADDING = float(os.environ.get("DETECTION_ROI_PADDING", 0.25))
+    # Sampling adaptif: berhenti begitu interval kepercayaan tidak memuat threshold
+    DETECTION_ADAPTIVE = os.environ.get("DETECTION_ADAPTIVE", "false").lower() == "true"
+    DETECTION_ADAPTIVE_Z = float(os.environ.get("DETECTION_ADAPTIVE_Z", 2.58))
+    DETECTION_ADAPTIVE_MIN_FRAMES = int(os.environ.get("DETECTION_ADAPTIVE_MIN_FRAMES", 6))
+    DETECTION_ADAPTIVE_BATCH = int(os.environ.get("DETECTION_ADAPTIVE_BATCH", 4))
+    # Cache fitur per frame (hash bytes frame); 0 mematikan, PATH = file SQLite bersama antar worker
+    DETECTION_FEATURE_CACHE_SIZE = int(os.environ.get("DETECTION_FEATURE_CACHE_SIZE", 4096))
+    DETECTION_FEATURE_CACHE_TTL = int(os.environ.get("DETECTION_FEATURE_CACHE_TTL", 600))
+    DETECTION_FEATURE_CACHE_PATH = os.environ.get("DETECTION_FEATURE_CACHE_PATH", "")
+    # Micro-batching inference antar request: flush di MAX_ROWS baris atau WAIT_MS; 0 mematikan
+    DETECTION_BATCH_MAX_ROWS = int(os.environ.get("DETECTION_BATCH_MAX_ROWS", 256))
+    DETECTION_BATCH_WAIT_MS = float(os.environ.get("DETECTION_BATCH_WAIT_MS", 0))
+    # Job deteksi asinkron (POST /jobs, polling GET /jobs/<id>)
+    DETECTION_JOB_WORKERS = int(os.environ.get("DETECTION_JOB_WORKERS", 2))
+    DETECTION_JOB_LIMIT = int(os.environ.get("DETECTION_JOB_LIMIT", 32))
+    DETECTION_JOB_TTL = int(os.environ.get("DETECTION_JOB_TTL", 600))
+    DETECTION_JOB_RETRIES = int(os.environ.get("DETECTION_JOB_RETRIES", 5))
+    # /results: batas limit per halaman dan umur cache total_count (detik)
+    DETECTION_RESULTS_MAX_LIMIT = int(os.environ.get("DETECTION_RESULTS_MAX_LIMIT", 100))
+    DETECTION_RESULTS_COUNT_TTL = int(os.environ.get("DETECTION_RESULTS_COUNT_TTL", 30))
+    # Riwayat deteksi per user (/api/user/detection-history, /history ML): ukuran halaman default dan maksimum
+    HISTORY_PAGE_SIZE = int(os.environ.get("HISTORY_PAGE_SIZE", 50))
+    HISTORY_MAX_LIMIT = int(os.environ.get("HISTORY_MAX_LIMIT", 200))
+
+    # Write-behind riwayat (LoginHistory, DetectionResult): bulk_write per BATCH dokumen atau INTERVAL detik
+    WRITE_BEHIND_ENABLED = os.environ.get("WRITE_BEHIND_ENABLED", "true").lower() == "true"
+    WRITE_BEHIND_BATCH = int(os.environ.get("WRITE_BEHIND_BATCH", 100))
+    WRITE_BEHIND_INTERVAL = float(os.environ.get("WRITE_BEHIND_INTERVAL", 1.0))
+    # Batas waktu flush terakhir saat worker berhenti; sisanya masuk file spill
+    WRITE_BEHIND_FINAL_TIMEOUT = float(os.environ.get("WRITE_BEHIND_FINAL_TIMEOUT", 2.0))
+    # Prefix file spill (<path>.<pid>) saat MongoDB tidak tersedia; kosong = tanpa spill
+    WRITE_BEHIND_SPILL_PATH = os.environ.get("WRITE_BEHIND_SPILL_PATH", "write_behind_spill.jsonl")
+    # Model berversi di app/ml/versions; 0 mematikan pemantauan file CURRENT
+    MODEL_WATCH_INTERVAL = int(os.environ.get("MODEL_WATCH_INTERVAL", 10))
+    MODEL_ADMIN_TOKEN = os.environ.get("MODEL_ADMIN_TOKEN")
@@ -0,0 +1,88 @@
+"""Konfigurasi gunicorn: preload model di master, warmup di setiap worker.
+
+Dengan GUNICORN_PRELOAD=true (default) aplikasi dimuat sekali di master
+sebelum fork; bila GUNICORN_WARMUP=true (default) stack ML dan artefak
+model di app/ml juga dimuat di master sehingga worker berbagi halaman
+memori itu secara copy-on-write. Untuk worker yang hanya melayani route
+non-deteksi, set GUNICORN_WARMUP=false: stack ML lalu baru dimuat saat
+endpoint deteksi pertama kali dipanggil. FaceMesh tidak dibuat di master
+(graph MediaPipe tidak aman di-fork); setiap worker membuatnya sendiri dan
+menjalankan satu frame sintetis di ``post_worker_init`` sebelum menerima
+request. Waktu startup dan RSS master/worker ditulis ke log gunicorn.
+
+Objek per proses di app/services (FaceMeshPool, ProcessEngine,
+BatchScheduler, JobStore, WriteBehindBuffer) membuat thread/executor-nya
+saat pertama dipakai dan mencatat PID pembuatnya, jadi aman dibuat di
+master lalu di-fork; setiap worker membuat miliknya sendiri. Sesi dan job
+deteksi tersimpan di memori worker yang menerimanya: dengan beberapa
+worker, klien harus diarahkan ke worker yang sama (sticky session) atau
+server dijalankan dengan satu worker ber-thread.
+"""
+import gc
+import os
+import resource
+import sys
+import time
+
+from gunicorn.arbiter import Arbiter
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '8080')}")
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+# gthread agar FaceMeshPool bisa melayani beberapa request per worker
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+warmup = os.environ.get("GUNICORN_WARMUP", "true").lower() == "true"
+# true: worker yang gagal warmup gagal boot; false: worker tetap jalan, /detection_health 503
+warmup_strict = os.environ.get("GUNICORN_WARMUP_STRICT", "false").lower() == "true"
+
+_started = time.monotonic()
+
+
+def rss_mb():
+    """RSS proses saat ini dalam MB (VmRSS, atau ru_maxrss bila /proc tidak ada)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def when_ready(server):
+    if preload_app and warmup:
+        # hanya artefak model; FaceMesh dibuat di setiap worker oleh detector()
+        from app.services.detector import load_artifacts
+        load_artifacts()
+    server.log.info("Master ready in %.2fs (preload=%s), RSS %.1f MB",
+                    time.monotonic() - _started, preload_app, rss_mb())
+    if preload_app:
+        # objek yang sudah ada tidak disentuh GC lagi, jadi halaman tetap dibagi setelah fork
+        gc.freeze()
+
+def post_fork(server, worker):
+    worker.forked_at = time.monotonic()
+
+def post_worker_init(worker):
+    warmup_time = 0.0
+    if warmup:
+        from app.api.detection_api import warmup as warmup_detection
+        start = time.monotonic()
+        try:
+            warmup_detection()
+        except Exception as e:
+            worker.log.error("Worker %s warmup failed: %s", worker.pid, e)
+            if warmup_strict:
+                # gunicorn menghentikan master bila worker gagal boot
+                sys.exit(Arbiter.WORKER_BOOT_ERROR)
+        warmup_time = time.monotonic() - start
+    worker.log.info("Worker %s ready in %.2fs (warmup %.2fs), RSS %.1f MB",
+                    worker.pid, time.monotonic() - worker.forked_at, warmup_time, rss_mb())
+
+def worker_exit(server, worker):
+    # kirim sisa antrean write-behind sebelum worker berhenti
+    module = sys.modules.get('app.services.write_behind')
+    if module:
+        module.writes.flush(final=True)
@@ -0,0 +1,69 @@
+"""Microbenchmark ekstraksi fitur: versi per titik vs versi vektor.
+
+Jalankan dari root repo:
+    python -m scripts.bench_features [--frames 30] [--repeat 20]
+
+Landmark dibuat acak dengan bentuk yang sama seperti keluaran FaceMesh
+(478 titik ternormalisasi), jadi MediaPipe tidak diperlukan.
+"""
+import argparse
+import timeit
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from app.services.features import FEATURE_COLUMNS, extract_feature_matrix, landmarks_to_array
+
+
+# Implementasi lama per titik, sebagai acuan hasil dan waktu
+def euclidean(p1, p2):
+    return np.linalg.norm(np.array(p1) - np.array(p2))
+
+def extract_features(landmarks):
+    try:
+        def pt(i): return (landmarks.landmark[i].x, landmarks.landmark[i].y)
+        return pd.DataFrame([{
+            'eyebrow_dist': euclidean(pt(55), pt(285)),
+            'eye_asymmetry': abs(
+                euclidean(pt(159), pt(145)) / (euclidean(pt(33), pt(133)) + 1e-8) -
+                euclidean(pt(386), pt(374)) / (euclidean(pt(362), pt(263)) + 1e-8)
+            ),
+            'mar': euclidean(pt(13), pt(14)) / (euclidean(pt(61), pt(291)) + 1e-8),
+            'mouth_asymmetry': abs(pt(61)[1] - pt(291)[1]),
+            'pucker_asymmetry': abs(pt(78)[0] - pt(308)[0]),
+        }], columns=FEATURE_COLUMNS)
+    except Exception as e:
+        print(f"❌ feature error: {e}")
+        return None
+
+def fake_landmarks(rng, count=478):
+    xy = rng.random((count, 2))
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y)) for x, y in xy])
+
+def legacy(frames):
+    return pd.concat([extract_features(l) for l in frames], ignore_index=True)
+
+def vectorized(frames):
+    return extract_feature_matrix(np.stack([landmarks_to_array(l) for l in frames]))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [fake_landmarks(rng) for _ in range(args.frames)]
+
+    expected = legacy(frames)[FEATURE_COLUMNS].to_numpy()
+    actual = vectorized(frames)
+    np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=0)
+    print(f"✅ hasil identik untuk {args.frames} frame (max abs diff {np.abs(actual - expected).max():.2e})")
+
+    for name, fn in [('legacy', legacy), ('vectorized', vectorized)]:
+        best = min(timeit.repeat(lambda: fn(frames), number=1, repeat=args.repeat))
+        print(f"{name:>10}: {best * 1000:8.3f} ms / request ({best / args.frames * 1e6:7.1f} µs / frame)")
+
+if __name__ == '__main__':
+    main()
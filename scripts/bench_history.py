@@ -0,0 +1,93 @@
+"""Bandingkan waktu respons dan memori riwayat deteksi per user: semua Document vs halaman as_pymongo.
+
+Butuh mongod lokal. Jalankan dari root repo:
+    python -m scripts.bench_history [--uri mongodb://localhost:27017/bench_history]
+                                    [--sizes 100 1000 10000] [--repeat 5]
+
+Untuk setiap ukuran riwayat, satu user diisi dokumen DetectionResult
+sebanyak itu, lalu dua jalur diukur sampai JSON siap dikirim: cara lama
+(semua dokumen sebagai Document mongoengine) dan cara baru (projection,
+``as_pymongo()`` dan satu halaman ``HISTORY_PAGE_SIZE``). Memori puncak
+diukur dengan tracemalloc. Database dihapus di akhir.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from mongoengine import connect, disconnect
+
+from app.model.detection_result import DetectionResult
+from app.services.pagination import cursor_page
+from config import Config
+
+
+def seed(user_id, size):
+    start = datetime(2024, 1, 1)
+    DetectionResult._get_collection().insert_many([{
+        'user_id': user_id,
+        'input_data': [{'type': 'frames', 'count': 30}],
+        'result': {
+            'prediction': 'Normal', 'is_positive': False, 'confidence': 0.2, 'percentage': 20.0,
+            'total_frames': 30, 'bellspalsy_frames': 3, 'normal_frames': 27,
+            'probabilities': {'normal': 0.8, 'bells_palsy': 0.2}
+        },
+        'detected_at': start + timedelta(minutes=i)
+    } for i in range(size)])
+
+def legacy(user_id):
+    detections = DetectionResult.objects(user_id=user_id).order_by('-detected_at')
+    return json.dumps([{
+        'user_id': det.user_id,
+        'result': det.result,
+        'detected_at': det.detected_at.isoformat()
+    } for det in detections])
+
+def paged(user_id):
+    detections, next_cursor = cursor_page(
+        DetectionResult.objects(user_id=user_id).only('result', 'detected_at').as_pymongo(),
+        'detected_at', None, Config.HISTORY_PAGE_SIZE
+    )
+    return json.dumps({'data': [{
+        'user_id': user_id,
+        'result': det.get('result'),
+        'detected_at': det['detected_at'].isoformat()
+    } for det in detections], 'next_cursor': next_cursor})
+
+def measure(fn, user_id, repeat):
+    best = min(_timed(fn, user_id) for _ in range(repeat))
+    tracemalloc.start()
+    fn(user_id)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+def _timed(fn, user_id):
+    t0 = time.perf_counter()
+    fn(user_id)
+    return time.perf_counter() - t0
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--uri', default='mongodb://localhost:27017/bench_history')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    disconnect()
+    connect(host=args.uri)
+    DetectionResult.drop_collection()
+    DetectionResult.ensure_indexes()
+    try:
+        for size in args.sizes:
+            user_id = f"user-{size}"
+            seed(user_id, size)
+            for name, fn in [('semua Document', legacy), ('halaman as_pymongo', paged)]:
+                seconds, peak = measure(fn, user_id, args.repeat)
+                print(f"{size:>7} dokumen  {name:>18}: {seconds * 1000:9.2f} ms   puncak {peak / 2**20:7.2f} MB")
+    finally:
+        DetectionResult.drop_collection()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Ukur latensi query riwayat deteksi sebelum dan sesudah indeks model dibuat.
+
+Butuh mongod lokal. Jalankan dari root repo:
+    python -m scripts.bench_indexes [--uri mongodb://localhost:27017]
+                                    [--docs 1000000] [--users 10000] [--queries 200]
+
+Database ``--db`` (default ``bench_indexes``) diisi ``--docs`` dokumen
+berbentuk DetectionResult, query yang dipakai endpoint riwayat diukur
+tanpa indeks (paling banyak 20 putaran, karena tiap query memindai seluruh
+collection), lalu indeks dari ``DetectionResult._meta`` dibuat dan query
+diukur ulang. Database dihapus di akhir kecuali ``--keep``.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from pymongo import MongoClient
+
+from app.model.detection_result import DetectionResult
+
+
+def seed(collection, docs, users, batch=10000):
+    start = datetime(2024, 1, 1)
+    rng = random.Random(0)
+    for offset in range(0, docs, batch):
+        collection.insert_many([{
+            'user_id': f"user-{rng.randrange(users)}",
+            'input_data': [{'type': 'frames', 'count': 30}],
+            'result': {'prediction': 'Normal', 'confidence': rng.random(), 'total_frames': 30},
+            'detected_at': start + timedelta(seconds=rng.randrange(60 * 60 * 24 * 365))
+        } for _ in range(min(batch, docs - offset))], ordered=False)
+
+def queries(collection, user_id):
+    """Query yang sama dengan /results, /history/last dan /api/user/detection-history."""
+    return {
+        'results?user_id (page 1)': lambda: list(collection.find({'user_id': user_id}).sort('detected_at', -1).limit(50)),
+        'history/last': lambda: collection.find_one({'user_id': user_id}, sort=[('detected_at', -1)]),
+        'results (all users)': lambda: list(collection.find().sort('detected_at', -1).limit(50)),
+        'results count': lambda: collection.count_documents({'user_id': user_id})
+    }
+
+def measure(collection, users, count):
+    rng = random.Random(1)
+    timings = {}
+    for _ in range(count):
+        for name, fn in queries(collection, f"user-{rng.randrange(users)}").items():
+            t0 = time.perf_counter()
+            fn()
+            timings.setdefault(name, []).append((time.perf_counter() - t0) * 1000)
+    plan = collection.find({'user_id': 'user-0'}).sort('detected_at', -1).limit(50).explain()['queryPlanner']['winningPlan']
+    return timings, plan
+
+def stages(plan):
+    names = [plan.get('stage')]
+    for key in ('inputStage', 'queryPlan'):
+        if key in plan:
+            names += stages(plan[key])
+    return [n for n in names if n]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--uri', default='mongodb://localhost:27017')
+    parser.add_argument('--db', default='bench_indexes')
+    parser.add_argument('--docs', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--keep', action='store_true')
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    collection = client[args.db][DetectionResult._get_collection_name()]
+    collection.drop()
+    t0 = time.perf_counter()
+    seed(collection, args.docs, args.users)
+    print(f"✅ {args.docs} dokumen diisi dalam {time.perf_counter() - t0:.1f}s")
+
+    before, plan_before = measure(collection, args.users, min(args.queries, 20))
+    t0 = time.perf_counter()
+    for spec in DetectionResult._meta['index_specs']:
+        collection.create_index(spec['fields'])
+    print(f"✅ indeks {[s['fields'] for s in DetectionResult._meta['index_specs']]} "
+          f"dibuat dalam {time.perf_counter() - t0:.1f}s")
+    after, plan_after = measure(collection, args.users, args.queries)
+
+    print(f"plan tanpa indeks: {' <- '.join(stages(plan_before))}")
+    print(f"plan dengan indeks: {' <- '.join(stages(plan_after))}")
+    for name in before:
+        print(f"{name:>26}: p50 {np.percentile(before[name], 50):9.2f} ms -> {np.percentile(after[name], 50):7.2f} ms"
+              f"   p99 {np.percentile(before[name], 99):9.2f} ms -> {np.percentile(after[name], 99):7.2f} ms")
+
+    if not args.keep:
+        client.drop_database(args.db)
+
+if __name__ == '__main__':
+    main()
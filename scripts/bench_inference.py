@@ -0,0 +1,59 @@
+"""Bandingkan inference sklearn (DataFrame per frame) dengan jalur NumPy.
+
+Jalankan dari root repo:
+    python -m scripts.bench_inference [--frames 30] [--repeat 50]
+
+Memakai app/ml/model_mlp.pkl dan app/ml/scaler.pkl yang sebenarnya, lalu
+memastikan probabilitas dan label kedua jalur sama sebelum mengukur waktu.
+"""
+import argparse
+import os
+import pickle
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from app.services.features import FEATURE_COLUMNS
+from app.services.inference import NumpyMLP
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', default=os.path.join('app', 'ml', 'model_mlp.pkl'))
+    parser.add_argument('--scaler', default=os.path.join('app', 'ml', 'scaler.pkl'))
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    model, scaler = load(args.model), load(args.scaler)
+    fast = NumpyMLP.from_sklearn(model, scaler)
+
+    # fitur sintetis di sekitar distribusi data latih scaler
+    rng = np.random.default_rng(0)
+    features = scaler.mean_ + scaler.scale_ * rng.standard_normal((args.frames, len(FEATURE_COLUMNS)))
+
+    def sklearn_path():
+        df = pd.concat([pd.DataFrame([row], columns=FEATURE_COLUMNS) for row in features], ignore_index=True)
+        scaled = scaler.transform(df)
+        return model.predict(scaled), model.predict_proba(scaled)
+
+    def numpy_path():
+        return fast.predict(features), fast.predict_proba(features)
+
+    expected_preds, expected_probs = sklearn_path()
+    preds, probs = numpy_path()
+    np.testing.assert_allclose(probs, expected_probs, rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(preds, expected_preds)
+    print(f"✅ output sama untuk {args.frames} frame (max abs diff {np.abs(probs - expected_probs).max():.2e})")
+
+    for name, fn in [('sklearn', sklearn_path), ('numpy', numpy_path)]:
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"{name:>8}: {best * 1000:8.3f} ms / request")
+
+if __name__ == '__main__':
+    main()
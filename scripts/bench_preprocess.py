@@ -0,0 +1,79 @@
+"""Ukur waktu tiap tahap preprocessing frame dan penghematannya.
+
+Jalankan dari root repo:
+    python -m scripts.bench_preprocess [folder] [--max-side 640] [--padding 0.25] [--repeat 3]
+
+Default memakai foto di static/uploads. Varian yang dibandingkan: resolusi
+penuh, decode diperkecil (IMREAD_REDUCED_* + resize) dan diperkecil + crop
+ROI wajah. Crop ROI hanya berarti untuk frame berurutan dari wajah yang sama.
+"""
+import argparse
+import os
+
+import numpy as np
+
+from app.services.features import FEATURE_COLUMNS, valid_rows
+from app.services.frames import create_face_mesh, process_frames
+
+STEPS = ['decode', 'convert', 'landmarks', 'features']
+
+
+def load_frames(folder):
+    names = sorted(n for n in os.listdir(folder) if n.lower().endswith(('.jpg', '.jpeg', '.png')))
+    frames = []
+    for name in names:
+        with open(os.path.join(folder, name), 'rb') as f:
+            frames.append(f.read())
+    return frames
+
+def measure(frames, repeat, **options):
+    face_mesh = create_face_mesh(True)
+    try:
+        best, features = None, None
+        for _ in range(repeat):
+            timings = {}
+            features = process_frames(face_mesh, frames, timings=timings, **options)
+            if best is None or sum(timings.values()) < sum(best.values()):
+                best = timings
+        return features, best
+    finally:
+        face_mesh.close()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('folder', nargs='?', default=os.path.join('static', 'uploads'))
+    parser.add_argument('--max-side', type=int, default=640)
+    parser.add_argument('--padding', type=float, default=0.25)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    frames = load_frames(args.folder)
+    if not frames:
+        raise SystemExit(f"No frames found in {args.folder}")
+    print(f"{len(frames)} frames, {sum(map(len, frames)) / len(frames) / 1024:.0f} KiB average")
+
+    variants = [
+        ('full', {}),
+        (f'max_side={args.max_side}', {'max_side': args.max_side}),
+        ('max_side+roi', {'max_side': args.max_side, 'roi_padding': args.padding}),
+    ]
+    baseline_features = baseline = None
+    print(f"{'variant':>14} " + ' '.join(f"{s:>10}" for s in STEPS) + f" {'total':>10} {'saved':>8}  (ms / frame)")
+    for name, options in variants:
+        features, timings = measure(frames, args.repeat, **options)
+        per_frame = {s: timings[s] / len(frames) * 1000 for s in STEPS}
+        total = sum(per_frame.values())
+        if baseline is None:
+            baseline, baseline_features = per_frame, features
+        saved = {s: baseline[s] - per_frame[s] for s in STEPS}
+        print(f"{name:>14} " + ' '.join(f"{per_frame[s]:10.2f}" for s in STEPS) +
+              f" {total:10.2f} {sum(baseline.values()) - total:8.2f}")
+        if options:
+            print(f"{'saved':>14} " + ' '.join(f"{saved[s]:10.2f}" for s in STEPS))
+            both = valid_rows(features) & valid_rows(baseline_features)
+            if both.any():
+                diff = np.abs(features[both] - baseline_features[both]).max(axis=0)
+                print(f"{'max |Δ|':>14} " + ', '.join(f"{c}={d:.1e}" for c, d in zip(FEATURE_COLUMNS, diff)))
+
+if __name__ == '__main__':
+    main()
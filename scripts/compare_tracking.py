@@ -0,0 +1,88 @@
+"""Bandingkan FaceMesh mode statis dan mode video (tracking) pada rekaman frame.
+
+Jalankan dari root repo:
+    python -m scripts.compare_tracking path/ke/folder_frame [--repeat 3]
+
+Frame dibaca berurutan menurut nama file (misalnya frame_0001.jpg, ...).
+Yang dilaporkan: latensi per frame kedua mode, jumlah frame dengan wajah,
+selisih fitur per kolom, dan (bila model tersedia) selisih probabilitas.
+"""
+import argparse
+import os
+import pickle
+import time
+
+import numpy as np
+
+from app.services.features import FEATURE_COLUMNS, valid_rows
+from app.services.frames import create_face_mesh, process_frames
+from app.services.inference import build_predictor
+
+
+def load_frames(folder):
+    names = sorted(n for n in os.listdir(folder) if n.lower().endswith(('.jpg', '.jpeg', '.png')))
+    frames = []
+    for name in names:
+        with open(os.path.join(folder, name), 'rb') as f:
+            frames.append(f.read())
+    return frames
+
+def run(static, frames, repeat):
+    face_mesh = create_face_mesh(static)
+    try:
+        best, features = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            features = process_frames(face_mesh, frames, reset=not static)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return features, best
+    finally:
+        face_mesh.close()
+
+def load_predictor():
+    try:
+        with open(os.path.join('app', 'ml', 'model_mlp.pkl'), 'rb') as f:
+            model = pickle.load(f)
+        with open(os.path.join('app', 'ml', 'scaler.pkl'), 'rb') as f:
+            scaler = pickle.load(f)
+    except OSError as e:
+        print(f"⚠️ model not available, skipping probability comparison: {e}")
+        return None
+    return build_predictor(model, scaler)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('folder')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    frames = load_frames(args.folder)
+    if not frames:
+        raise SystemExit(f"No frames found in {args.folder}")
+
+    static_features, static_time = run(True, frames, args.repeat)
+    video_features, video_time = run(False, frames, args.repeat)
+
+    print(f"{len(frames)} frames")
+    for name, features, elapsed in [('static', static_features, static_time), ('video', video_features, video_time)]:
+        print(f"{name:>7}: {elapsed / len(frames) * 1000:7.2f} ms / frame, "
+              f"{int(valid_rows(features).sum())} frames with face")
+    print(f"speedup: {static_time / video_time:.2f}x")
+
+    both = valid_rows(static_features) & valid_rows(video_features)
+    if not both.any():
+        return
+    diff = np.abs(static_features[both] - video_features[both])
+    for i, column in enumerate(FEATURE_COLUMNS):
+        print(f"{column:>17}: mean |Δ| {diff[:, i].mean():.2e}, max |Δ| {diff[:, i].max():.2e}")
+
+    predictor = load_predictor()
+    if predictor is not None:
+        static_probs = predictor.predict_proba(static_features[both])[:, 1]
+        video_probs = predictor.predict_proba(video_features[both])[:, 1]
+        print(f"probability: static avg {static_probs.mean():.4f}, video avg {video_probs.mean():.4f}, "
+              f"max per-frame |Δ| {np.abs(static_probs - video_probs).max():.4f}")
+
+if __name__ == '__main__':
+    main()
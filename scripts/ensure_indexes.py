@@ -0,0 +1,43 @@
+"""Buat dan verifikasi indeks MongoDB yang dideklarasikan di ``meta`` model.
+
+Jalankan saat deploy dari root repo (fase ``release`` di Procfile; pada
+image dockerfile dijalankan otomatis sebelum gunicorn):
+    python -m scripts.ensure_indexes [--check]
+
+Model riwayat memakai ``auto_create_index: False`` sehingga indeks tidak
+dibangun di tengah request; script ini yang membuatnya. Dengan ``--check``
+indeks hanya dibandingkan, dan exit code 1 bila ada yang belum dibuat.
+"""
+import argparse
+import sys
+
+from app.model.detection_result import DetectionResult
+from app.model.login_history import LoginHistory
+from app.model.password_history import PasswordHistory
+from app.model.user import User
+
+MODELS = [User, DetectionResult, LoginHistory, PasswordHistory]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--check', action='store_true', help='hanya verifikasi, jangan buat indeks')
+    args = parser.parse_args()
+
+    ok = True
+    for model in MODELS:
+        name = model._get_collection_name()
+        if not args.check:
+            model.ensure_indexes()
+        diff = model.compare_indexes()
+        if diff['missing']:
+            ok = False
+            print(f"❌ {name}: missing indexes {diff['missing']}")
+        else:
+            print(f"✅ {name}: {len(model._meta['index_specs'])} indexes in place")
+        if diff['extra']:
+            print(f"⚠️ {name}: indexes not declared in the model {diff['extra']}")
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
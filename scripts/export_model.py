@@ -0,0 +1,60 @@
+"""Ekspor model_mlp.pkl + scaler.pkl ke format .npz yang bisa di-memory-map.
+
+Jalankan dari root repo:
+    python -m scripts.export_model [--model app/ml/model_mlp.pkl] \\
+        [--scaler app/ml/scaler.pkl] [--out app/ml/model.npz]
+
+Setelah menulis file, skrip memastikan hasil loader .npz sama dengan
+sklearn dan membandingkan waktu muat pickle dengan .npz. Registry model
+memakai model.npz secara otomatis bila file itu ada di direktori versi.
+"""
+import argparse
+import os
+import pickle
+import time
+
+import numpy as np
+
+from app.services.features import FEATURE_COLUMNS
+from app.services.inference import NumpyMLP
+from app.services.model_format import export_npz, load_npz
+
+
+def load_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def timed(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', default=os.path.join('app', 'ml', 'model_mlp.pkl'))
+    parser.add_argument('--scaler', default=os.path.join('app', 'ml', 'scaler.pkl'))
+    parser.add_argument('--out', default=os.path.join('app', 'ml', 'model.npz'))
+    args = parser.parse_args()
+
+    model, scaler = load_pickle(args.model), load_pickle(args.scaler)
+    export_npz(NumpyMLP.from_sklearn(model, scaler), args.out)
+    print(f"✅ Wrote {args.out} ({os.path.getsize(args.out) / 1024:.1f} KiB)")
+
+    rng = np.random.default_rng(0)
+    features = scaler.mean_ + scaler.scale_ * rng.standard_normal((256, len(FEATURE_COLUMNS)))
+    expected = model.predict_proba(scaler.transform(features))
+    for mmap in (True, False):
+        np.testing.assert_allclose(load_npz(args.out, mmap=mmap).predict_proba(features), expected,
+                                   rtol=1e-9, atol=1e-12)
+    print("✅ .npz predictions match sklearn")
+
+    pickle_time = timed(lambda: (load_pickle(args.model), load_pickle(args.scaler)))
+    npz_time = timed(lambda: load_npz(args.out))
+    print(f"load pickle: {pickle_time * 1000:.2f} ms, load .npz (mmap): {npz_time * 1000:.2f} ms")
+
+if __name__ == '__main__':
+    main()
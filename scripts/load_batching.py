@@ -0,0 +1,84 @@
+"""Load test micro-batching inference: request bersamaan dengan dan tanpa BatchScheduler.
+
+Jalankan dari root repo:
+    python -m scripts.load_batching [--backend numpy|sklearn] [--clients 32]
+                                    [--requests 200] [--frames 8]
+                                    [--max-rows 256] [--wait-ms 2]
+
+Setiap client adalah thread yang mengirim ``--requests`` inference
+berturut-turut, masing-masing ``--frames`` baris fitur. Memakai
+app/ml/model_mlp.pkl dan app/ml/scaler.pkl, lewat NumpyMLP atau langsung
+sklearn (``--backend sklearn``, overhead per panggilan jauh lebih besar
+sehingga batching paling terasa). Hasil batching dicek sama dengan
+inference langsung sebelum throughput diukur.
+"""
+import argparse
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+
+from app.services.batching import BatchScheduler
+from app.services.features import FEATURE_COLUMNS
+from app.services.inference import NumpyMLP, SklearnModel
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def run_load(predict, clients, requests, rows):
+    """Jalankan ``clients`` thread; kembalikan (request/detik, latensi p50 ms, latensi p99 ms)."""
+    latencies = [[] for _ in range(clients)]
+    start_gate = threading.Barrier(clients + 1)
+
+    def client(i):
+        rng = np.random.default_rng(i)
+        features = rng.standard_normal((rows, len(FEATURE_COLUMNS)))
+        start_gate.wait()
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            predict(features)
+            latencies[i].append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    start_gate.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    all_latencies = np.concatenate(latencies) * 1000
+    return clients * requests / elapsed, np.percentile(all_latencies, 50), np.percentile(all_latencies, 99)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', default=os.path.join('app', 'ml', 'model_mlp.pkl'))
+    parser.add_argument('--scaler', default=os.path.join('app', 'ml', 'scaler.pkl'))
+    parser.add_argument('--backend', choices=['numpy', 'sklearn'], default='numpy')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--frames', type=int, default=8)
+    parser.add_argument('--max-rows', type=int, default=256)
+    parser.add_argument('--wait-ms', type=float, default=2)
+    args = parser.parse_args()
+
+    model, scaler = load(args.model), load(args.scaler)
+    predictor = NumpyMLP.from_sklearn(model, scaler) if args.backend == 'numpy' else SklearnModel(model, scaler)
+    scheduler = BatchScheduler(max_rows=args.max_rows, max_wait=args.wait_ms / 1000)
+    batched = scheduler.bind(predictor)
+
+    sample = np.random.default_rng(1).standard_normal((args.frames, len(FEATURE_COLUMNS)))
+    np.testing.assert_allclose(batched.predict_proba(sample), predictor.predict_proba(sample))
+    print("✅ hasil batching sama dengan inference langsung")
+
+    for name, predict in [('direct', predictor.predict_proba), ('batched', batched.predict_proba)]:
+        throughput, p50, p99 = run_load(predict, args.clients, args.requests, args.frames)
+        print(f"{name:>8}: {throughput:9.0f} request/s   p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+    print(f"batching: {scheduler.stats()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Terbitkan model, scaler dan feature_columns.txt sebagai versi baru di app/ml/versions.
+
+Jalankan dari root repo:
+    python -m scripts.publish_model 2025-01-15 \\
+        [--npz path/model.npz] [--model path/model_mlp.pkl --scaler path/scaler.pkl] \\
+        [--columns path/feature_columns.txt] [--activate]
+
+Versi dengan ``--npz`` (lihat scripts/export_model.py) dimuat tanpa pickle;
+pickle sklearn tetap bisa disertakan untuk MLController.
+
+Dengan ``--activate`` file app/ml/CURRENT ikut diganti; worker yang
+berjalan memuat versi baru lewat file watcher (MODEL_WATCH_INTERVAL)
+tanpa restart.
+"""
+import argparse
+import os
+
+from app.services.model_registry import registry
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('version')
+    parser.add_argument('--npz')
+    parser.add_argument('--model')
+    parser.add_argument('--scaler')
+    parser.add_argument('--columns', default=os.path.join('app', 'ml', 'feature_columns.txt'))
+    parser.add_argument('--activate', action='store_true')
+    args = parser.parse_args()
+
+    if not args.npz and not (args.model and args.scaler):
+        parser.error('--npz or both --model and --scaler are required')
+    files = {'feature_columns.txt': args.columns}
+    if args.npz:
+        files['model.npz'] = args.npz
+    if args.model:
+        files['model_mlp.pkl'] = args.model
+    if args.scaler:
+        files['scaler.pkl'] = args.scaler
+    registry.store.publish(args.version, files)
+    # pastikan versi bisa dimuat sebelum diaktifkan
+    bundle = registry.load_bundle(args.version)
+    print(f"✅ Published model version {bundle.version}")
+    if args.activate:
+        registry.store.activate(args.version)
+        print(f"✅ {args.version} is now CURRENT")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Laporan waktu impor dan memori per blueprint (gaya ``python -X importtime``).
+
+Jalankan dari root repo:
+    python -m scripts.startup_report [--top 8] [modul ...]
+
+Setiap modul diimpor di proses Python baru dengan ``-X importtime``.
+Yang dilaporkan: waktu impor modul, RSS puncak, apakah stack
+ML berat ikut termuat, dan impor paling mahal. Tanpa argumen semua modul
+blueprint yang didaftarkan server.py dilaporkan, lalu ``server`` sendiri.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+BLUEPRINTS = [
+    'app.routes.auth_routes',
+    'app.routes.user_routes',
+    'app.api.api',
+    'app.routes.chart_routes',
+    'app.routes.scrape',
+    'app.api.detection_api',
+    'app.api.video_api',
+    'server',
+]
+HEAVY = ['numpy', 'pandas', 'cv2', 'mediapipe', 'sklearn']
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'wall': elapsed,
+    'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'heavy': [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Baris ``import time: self | cumulative | package`` menjadi list (cumulative_us, package)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, package = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative), package.rstrip()))
+    return rows
+
+def report(module, top):
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD.format(module=module, heavy=HEAVY)],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        print(f"{module}: import failed\n{proc.stderr.strip().splitlines()[-1]}")
+        return
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = parse_importtime(proc.stderr)
+    print(f"{module}: import {result['wall']:.2f}s, "
+          f"max RSS {result['maxrss_kb'] / 1024:.0f} MB, "
+          f"ML stack: {', '.join(result['heavy']) or '-'}")
+    for cumulative, package in sorted(rows, reverse=True)[:top]:
+        print(f"    {cumulative / 1e6:7.3f}s  {package.strip()}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('modules', nargs='*', default=BLUEPRINTS)
+    parser.add_argument('--top', type=int, default=8)
+    args = parser.parse_args()
+    for module in args.modules:
+        report(module, args.top)
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,7 @@ from app.routes.chart_routes import chart
 from app.routes.scrape import scrape_bp
 from app.api.detection_api import detection_api
 from app.api.video_api import video_api
+from app.db import init_pymongo
 
 # Load environment variables
 env_path = os.path.join(os.path.dirname(__file__), '.env')
@@ -25,8 +26,9 @@ CORS(app)
 app.config['JWT_SECRET_KEY'] = 'rahasia-capstone-therapalsy'
 app.config['MONGO_URI'] = os.getenv("MONGO_URI")
 
-# Inisialisasi ekstensi
-mongo = PyMongo(app)
+# Inisialisasi ekstensi; PyMongo dan mongoengine memakai satu client per proses (app/db.py)
+mongo = PyMongo()
+init_pymongo(mongo, app)
 jwt = JWTManager(app)
 
 # Register semua blueprint
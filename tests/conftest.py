@@ -0,0 +1,60 @@
+import os
+import types
+
+import pytest
+
+# client dibuat dengan connect=False, jadi import app tidak butuh mongod
+os.environ.setdefault('MONGO_URI', 'mongodb://localhost:27017/test_backend')
+os.environ.setdefault('DB_DATABASE', 'test_backend')
+
+from flask import Flask
+
+from app.api import detection_api as api
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.register_blueprint(api.detection_api, url_prefix='/api/detection')
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def fake_detector(monkeypatch):
+    """Detector palsu: tanpa MediaPipe dan model, ``detect`` mencatat frame yang diterima."""
+    calls = []
+
+    def detect(frames, adaptive=False):
+        calls.append(frames)
+        return {'prediction': 'Normal', 'confidence': 0.8, 'total_frames': len(frames)}
+
+    fake = types.SimpleNamespace(models_ready=lambda: True, detect=detect, calls=calls)
+    monkeypatch.setattr(api, '_detector', fake)
+    return fake
+
+@pytest.fixture
+def saved(monkeypatch):
+    """Dokumen yang masuk ke write-behind buffer, tanpa MongoDB."""
+    documents = []
+
+    def insert(document):
+        documents.append(document)
+        return document.id
+
+    monkeypatch.setattr(api.writes, 'insert', insert)
+    return documents
+
+@pytest.fixture
+def mongo():
+    """Koneksi default mongoengine ke mongomock; dilewati bila mongomock tidak terpasang."""
+    mongomock = pytest.importorskip('mongomock')
+    from mongoengine import connect, disconnect
+
+    disconnect()
+    connect('test_backend', host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+    api.result_counts._counts.clear()
+    yield
+    disconnect()
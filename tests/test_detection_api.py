@@ -0,0 +1,98 @@
+import io
+import types
+
+from app.api import detection_api as api
+from app.services.face_mesh_pool import PoolBusy
+
+
+def test_predict_multipart_save_reads_form_fields(client, fake_detector, saved):
+    response = client.post('/api/detection/predict_bellspalsy', data={
+        'frames': [(io.BytesIO(b'jpeg-1'), 'f1.jpg'), (io.BytesIO(b'jpeg-2'), 'f2.jpg')],
+        'save': 'true',
+        'user_id': 'user-1'
+    }, content_type='multipart/form-data')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert fake_detector.calls == [[b'jpeg-1', b'jpeg-2']]
+    assert len(saved) == 1
+    assert saved[0].user_id == 'user-1'
+    assert body['document_id'] == str(saved[0].id)
+
+def test_predict_multipart_save_requires_user_id(client, fake_detector, saved):
+    response = client.post('/api/detection/predict_bellspalsy', data={
+        'frames': [(io.BytesIO(b'jpeg-1'), 'f1.jpg')],
+        'save': 'true'
+    }, content_type='multipart/form-data')
+
+    assert response.status_code == 400
+    assert not fake_detector.calls
+    assert not saved
+
+def test_predict_json_without_save_does_not_write(client, fake_detector, saved):
+    response = client.post('/api/detection/predict_bellspalsy', json={'frames': ['anBlZw==']})
+
+    assert response.status_code == 200
+    assert 'document_id' not in response.get_json()
+    assert not saved
+
+def test_save_reports_queued_write(client, saved):
+    response = client.post('/api/detection/save', json={'user_id': 'user-1', 'confidence': 0.7, 'prediction': 'Normal'})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert 'queued' in body['message']
+    assert body['document_id'] == str(saved[0].id)
+
+def test_busy_session_chunk_does_not_use_frame_quota(client, fake_detector):
+    def busy(session, frames):
+        raise PoolBusy('Detection queue is full')
+
+    fake_detector.detect_chunk = busy
+    session = api.sessions.create()
+    try:
+        response = client.post(f'/api/detection/sessions/{session.id}/frames', json={'frames': ['anBlZw==']})
+        assert response.status_code == 503
+        assert response.headers['Retry-After']
+        assert session.frames_received == 0
+    finally:
+        api.sessions.close(session.id)
+
+def test_frame_count_limit_applies_to_json_and_multipart(client, fake_detector, monkeypatch):
+    monkeypatch.setattr(api.Config, 'DETECTION_MAX_FRAMES', 2)
+
+    response = client.post('/api/detection/predict_bellspalsy', json={'frames': ['anBlZw=='] * 3})
+    assert response.status_code == 413
+
+    response = client.post('/api/detection/predict_bellspalsy', data={
+        'frames': [(io.BytesIO(b'jpeg'), f'f{i}.jpg') for i in range(3)]
+    }, content_type='multipart/form-data')
+    assert response.status_code == 413
+    assert not fake_detector.calls
+
+def test_frame_size_limit_applies_to_multipart(client, fake_detector, monkeypatch):
+    monkeypatch.setattr(api.Config, 'DETECTION_MAX_FRAME_BYTES', 4)
+
+    response = client.post('/api/detection/predict_bellspalsy', data={
+        'frames': [(io.BytesIO(b'too-large'), 'f1.jpg')]
+    }, content_type='multipart/form-data')
+    assert response.status_code == 413
+    assert not fake_detector.calls
+
+def test_latest_result_accepts_dict_results(client, monkeypatch):
+    document = api.DetectionResult(user_id='user-1', result={'prediction': 'Normal', 'confidence': 0.8})
+    queryset = types.SimpleNamespace(order_by=lambda field: types.SimpleNamespace(first=lambda: document))
+    monkeypatch.setattr(api.DetectionResult, 'objects', lambda **query: queryset)
+
+    response = client.get('/api/detection/history/last/user-1')
+
+    assert response.status_code == 200
+    assert response.get_json()['result']['parsed_result'] == {'prediction': 'Normal', 'confidence': 0.8}
+
+def test_health_is_503_when_detection_is_not_ready(client, fake_detector):
+    fake_detector.stats = lambda: {'status': 'unhealthy', 'mediapipe_initialized': False}
+
+    response = client.get('/api/detection/detection_health')
+
+    assert response.status_code == 503
+    assert response.get_json()['status'] == 'unhealthy'
@@ -0,0 +1,20 @@
+from app.services.detection_jobs import DetectionJob, JobStore
+
+
+def test_purge_skips_jobs_without_finished_at():
+    store = JobStore(ttl=0)
+    job = DetectionJob('job-1')
+    # status sudah final tetapi finished_at belum diisi
+    job.status = 'done'
+    store._jobs[job.id] = job
+
+    assert store.get(job.id) is job
+
+def test_finished_job_has_result_and_timestamp():
+    store = JobStore()
+    job = store.submit(lambda value: {'value': value}, 3)
+    store._executor.shutdown(wait=True)
+
+    assert job.status == 'done'
+    assert job.result == {'value': 3}
+    assert job.finished_at >= job.started_at
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.model.detection_result import DetectionResult
+
+
+@pytest.fixture
+def seeded(mongo):
+    """Tujuh hasil untuk user-1 dengan detected_at kembar berpasangan, ditambah satu milik user lain."""
+    start = datetime(2024, 1, 1)
+    for i in range(7):
+        DetectionResult(user_id='user-1', result={'n': i}, detected_at=start + timedelta(minutes=i // 2)).save()
+    DetectionResult(user_id='user-2', result={'n': 99}, detected_at=start).save()
+
+def ids(body):
+    return [row['id'] for row in body['results']]
+
+def test_cursor_pages_match_page_limit_pages(client, seeded):
+    by_page, page = [], 1
+    while True:
+        body = client.get(f'/api/detection/results?user_id=user-1&limit=3&page={page}').get_json()
+        by_page += ids(body)
+        if not body['has_next']:
+            break
+        page += 1
+
+    by_cursor, cursor = [], ''
+    while True:
+        body = client.get(f'/api/detection/results?user_id=user-1&limit=3&cursor={cursor}').get_json()
+        by_cursor += ids(body)
+        if body['next_cursor'] is None:
+            break
+        cursor = body['next_cursor']
+
+    assert len(by_page) == 7
+    assert by_cursor == by_page
+    assert body['has_next'] is False
+
+def test_invalid_cursor_returns_400(client, seeded):
+    response = client.get('/api/detection/results?cursor=not-a-cursor')
+
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('query', ['limit=abc', 'page=abc'])
+def test_invalid_limit_or_page_returns_400(client, seeded, query):
+    response = client.get(f'/api/detection/results?{query}')
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
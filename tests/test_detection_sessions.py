@@ -0,0 +1,38 @@
+import pytest
+
+from app.services.detection_sessions import SessionStore
+from app.services.face_mesh_pool import PoolBusy
+
+
+class FakeFaceMesh:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+def run(face_mesh, frames):
+    return len(frames)
+
+def test_tracker_graphs_are_limited_and_freed_on_close():
+    store = SessionStore(face_mesh_factory=FakeFaceMesh, max_trackers=1)
+    first, second = store.create(), store.create()
+
+    assert first.track(run, [b'a']) == 1
+    with pytest.raises(PoolBusy):
+        second.track(run, [b'b'])
+    assert store.stats()['trackers_in_use'] == 1
+
+    store.close(first.id)
+    assert second.track(run, [b'b', b'c']) == 2
+
+def test_failed_factory_returns_tracker_slot():
+    def broken():
+        raise RuntimeError('mediapipe unavailable')
+
+    store = SessionStore(face_mesh_factory=broken, max_trackers=1)
+    session = store.create()
+    with pytest.raises(RuntimeError):
+        session.track(run, [b'a'])
+
+    session.face_mesh_factory = FakeFaceMesh
+    assert session.track(run, [b'a']) == 1
@@ -0,0 +1,25 @@
+import pytest
+
+from app.services.face_mesh_pool import FaceMeshPool
+
+
+def test_start_builds_every_instance_up_front():
+    created = []
+    pool = FaceMeshPool(lambda: created.append(object()) or created[-1], size=2)
+
+    assert not pool.started
+    pool.start()
+
+    assert pool.started
+    assert len(created) == 2
+    assert pool.stats()['started']
+
+def test_start_raises_factory_errors_and_stays_unstarted():
+    def broken():
+        raise RuntimeError('mediapipe unavailable')
+
+    pool = FaceMeshPool(broken, size=2)
+
+    with pytest.raises(RuntimeError):
+        pool.start()
+    assert not pool.started
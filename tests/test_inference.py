@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+from app.services.features import FEATURE_COLUMNS
+from app.services.inference import NumpyMLP, build_predictor
+
+
+def fitted(columns):
+    """MLP + scaler kecil yang dilatih pada DataFrame dengan urutan kolom ``columns``."""
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(200, len(FEATURE_COLUMNS)))
+    labels = np.where(features[:, 0] + features[:, 3] > 0, "Bell's Palsy", 'Normal')
+    data = pd.DataFrame(features, columns=FEATURE_COLUMNS)[columns]
+    scaler = StandardScaler().fit(data)
+    model = MLPClassifier(hidden_layer_sizes=(8, 4), max_iter=300, random_state=0).fit(scaler.transform(data), labels)
+    return model, scaler
+
+def expected(model, scaler, features):
+    data = pd.DataFrame(features, columns=FEATURE_COLUMNS)[list(scaler.feature_names_in_)]
+    return model.predict_proba(scaler.transform(data))
+
+@pytest.fixture
+def features():
+    return np.random.default_rng(1).normal(size=(32, len(FEATURE_COLUMNS)))
+
+@pytest.mark.filterwarnings('ignore::sklearn.exceptions.ConvergenceWarning')
+@pytest.mark.parametrize('columns', [FEATURE_COLUMNS, FEATURE_COLUMNS[::-1]], ids=['ordered', 'reordered'])
+def test_numpy_predictor_matches_sklearn(columns, features):
+    model, scaler = fitted(columns)
+    predictor = build_predictor(model, scaler)
+
+    assert isinstance(predictor, NumpyMLP)
+    np.testing.assert_allclose(predictor.predict_proba(features), expected(model, scaler, features), atol=1e-12)
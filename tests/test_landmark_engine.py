@@ -0,0 +1,42 @@
+import os
+import types
+from functools import partial
+
+import numpy as np
+import pytest
+
+from app.services import landmark_engine
+from app.services.landmark_engine import ProcessEngine, roi_padding
+
+
+def config(**overrides):
+    values = dict(DETECTION_ROI_CROP=True, DETECTION_ROI_PADDING=0.25,
+                  DETECTION_MEDIAPIPE_MODE='static', DETECTION_FEATURE_CACHE_SIZE=0)
+    return types.SimpleNamespace(**{**values, **overrides})
+
+def test_roi_crop_used_in_static_mode_without_cache():
+    assert roi_padding(config()) == 0.25
+
+@pytest.mark.parametrize('overrides', [
+    {'DETECTION_ROI_CROP': False},
+    {'DETECTION_FEATURE_CACHE_SIZE': 4096},
+    {'DETECTION_MEDIAPIPE_MODE': 'video'},
+])
+def test_roi_crop_disabled_when_unsafe(overrides):
+    assert roi_padding(config(**overrides)) is None
+
+def crash_once(marker, face_mesh, frames, reset):
+    # proses worker pertama mati seperti terkena OOM killer
+    if not os.path.exists(marker):
+        open(marker, 'w').close()
+        os._exit(1)
+    return np.zeros((len(frames), 5))
+
+def test_process_engine_rebuilds_broken_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(landmark_engine, 'create_face_mesh', lambda static: None)
+    engine = ProcessEngine(workers=1, start_method='fork', process=partial(crash_once, str(tmp_path / 'crashed')))
+    try:
+        assert engine.run([b'a', b'b']).shape == (2, 5)
+        assert engine.run([b'c']).shape == (1, 5)
+    finally:
+        engine._executor.shutdown()
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.features import FEATURE_COLUMNS
+from app.services.inference import build_predictor
+from app.services.model_format import export_npz, load_npz
+from test_inference import expected, fitted
+
+
+@pytest.fixture
+def features():
+    return np.random.default_rng(1).normal(size=(32, len(FEATURE_COLUMNS)))
+
+@pytest.mark.filterwarnings('ignore::sklearn.exceptions.ConvergenceWarning')
+@pytest.mark.parametrize('mmap', [True, False])
+@pytest.mark.parametrize('columns', [FEATURE_COLUMNS, FEATURE_COLUMNS[::-1]], ids=['ordered', 'reordered'])
+def test_npz_round_trip_matches_sklearn(columns, mmap, features, tmp_path):
+    model, scaler = fitted(columns)
+    path = tmp_path / 'model.npz'
+    export_npz(build_predictor(model, scaler), path)
+
+    predictor = load_npz(path, mmap=mmap)
+
+    np.testing.assert_allclose(predictor.predict_proba(features), expected(model, scaler, features), atol=1e-12)
+    assert list(predictor.predict(features)) == list(model.predict(scaler.transform(
+        pd.DataFrame(features, columns=FEATURE_COLUMNS)[list(scaler.feature_names_in_)])))
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from app.services.model_registry import ArtifactStore, ModelRegistry
+
+
+def read_text(path):
+    with open(path) as f:
+        return f.read()
+
+@pytest.fixture
+def registry(tmp_path):
+    source = tmp_path / 'model.txt'
+    source.write_text('v1')
+    store = ArtifactStore(str(tmp_path / 'ml'))
+    store.publish('v1', {'model.txt': str(source)})
+    registry = ModelRegistry(store)
+    registry.register('model', 'model.txt', read_text)
+    return registry
+
+def test_unknown_or_traversing_versions_are_rejected(registry):
+    for version in ['v2', '..', '../..', 'v1/../v1']:
+        with pytest.raises(ValueError):
+            registry.reload_async(version)
+        with pytest.raises(ValueError):
+            registry.load_bundle(version)
+    with pytest.raises(ValueError):
+        registry.store.publish('../outside', {})
+
+def test_activate_writes_current_only_after_successful_load(registry):
+    registry.reload_async('v1', activate=True).join()
+
+    assert registry.store.current_version() == 'v1'
+    assert registry.metadata()['version'] == 'v1'
+
+def test_broken_version_is_not_activated(registry, tmp_path):
+    source = tmp_path / 'model.txt'
+    registry.store.publish('v2', {'model.txt': str(source)})
+    # isi berubah setelah terbit: checksum manifest tidak cocok
+    (tmp_path / 'ml' / 'versions' / 'v2' / 'model.txt').write_text('corrupted')
+
+    registry.reload_async('v2', activate=True).join()
+
+    assert registry.store.current_version() is None
+    assert registry.metadata()['version'] is None
+
+def test_watcher_keeps_unactivated_reload_until_current_changes(registry, tmp_path):
+    source = tmp_path / 'model.txt'
+    registry.store.publish('v2', {'model.txt': str(source)})
+    registry.store.publish('v3', {'model.txt': str(source)})
+    registry.store.activate('v1')
+    registry.reload()
+    registry.watch(0.01)
+
+    registry.reload('v2')
+    time.sleep(0.1)
+    assert registry.metadata()['version'] == 'v2'
+
+    registry.store.activate('v3')
+    time.sleep(0.1)
+    assert registry.metadata()['version'] == 'v3'
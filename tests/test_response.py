@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from flask import Flask, request
+
+from app.response import stream_json
+
+
+def rows(fail_after=None):
+    for i in range(5):
+        if i == fail_after:
+            raise RuntimeError('cursor lost')
+        yield {'i': i}
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.route('/rows')
+    def listing():
+        fail_after = request.args.get('fail_after', type=int)
+        key = request.args.get('key', 'data') or None
+        return stream_json(rows(fail_after), key=key, head={'success': True},
+                           tail=lambda count: {'count': count}, chunk_size=8)
+
+    return app.test_client()
+
+def test_complete_stream_ends_with_tail(client):
+    body = client.get('/rows').get_json()
+
+    assert body == {'success': True, 'data': [{'i': i} for i in range(5)], 'count': 5}
+
+def test_mid_stream_failure_ends_json_with_error(client):
+    response = client.get('/rows?fail_after=3')
+
+    assert response.status_code == 200
+    body = json.loads(response.data)
+    assert body['data'] == [{'i': 0}, {'i': 1}, {'i': 2}]
+    assert body['error']['success'] is False
+    assert body['error']['count'] == 3
+    assert 'count' not in body
+
+def test_mid_stream_failure_ends_array_with_error_element(client):
+    body = json.loads(client.get('/rows?fail_after=2&key=').data)
+
+    assert body[:2] == [{'i': 0}, {'i': 1}]
+    assert body[-1]['error']['count'] == 2
+
+def test_mid_stream_failure_ends_ndjson_with_error_line(client):
+    response = client.get('/rows?fail_after=3&format=ndjson')
+
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert lines[:3] == [{'i': 0}, {'i': 1}, {'i': 2}]
+    assert 'cursor lost' in lines[-1]['error']['error']
+    assert not any('meta' in line for line in lines)
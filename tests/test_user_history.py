@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+
+from app.model.detection_result import DetectionResult
+from app.routes.user_routes import users
+
+
+@pytest.fixture
+def history(mongo):
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-with-enough-length!'
+    JWTManager(app)
+    app.register_blueprint(users, url_prefix='/api/user')
+
+    start = datetime(2024, 1, 1)
+    for i in range(7):
+        DetectionResult(user_id='user-1', result={'n': i}, detected_at=start + timedelta(minutes=i // 2)).save()
+    DetectionResult(user_id='user-2', result={'n': 99}, detected_at=start).save()
+
+    with app.app_context():
+        token = create_access_token(identity='user-1')
+    client = app.test_client()
+    return lambda query='': client.get(f'/api/user/detection-history?{query}',
+                                       headers={'Authorization': f'Bearer {token}'})
+
+def test_cursor_pages_cover_history_in_order(history):
+    expected = [row['result']['n'] for row in history('limit=50').get_json()['data']]
+
+    seen, cursor = [], ''
+    while True:
+        body = history(f'limit=3&cursor={cursor}').get_json()
+        seen += [row['result']['n'] for row in body['data']]
+        if body['next_cursor'] is None:
+            break
+        cursor = body['next_cursor']
+
+    assert sorted(expected) == list(range(7))
+    assert seen == expected
+    # terbaru dulu; detected_at kembar diurutkan _id menurun
+    assert expected == [6, 5, 4, 3, 2, 1, 0]
+
+def test_invalid_cursor_or_limit_returns_400(history):
+    assert history('cursor=not-a-cursor').status_code == 400
+    assert history('limit=abc').status_code == 400
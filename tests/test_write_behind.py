@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from bson import json_util
+
+from app.services import write_behind
+from app.services.write_behind import WriteBehindBuffer
+
+
+class FakeCollection:
+    def __init__(self, error=None):
+        self.error = error
+        self.requests = []
+
+    def bulk_write(self, requests, ordered=True):
+        if self.error:
+            raise self.error
+        self.requests += requests
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(write_behind, 'get_db', lambda: {'logs': collection})
+    return collection
+
+def queue(buffer, *ids):
+    with buffer._lock:
+        buffer._pending += [{'c': 'logs', 'insert': {'_id': i}} for i in ids]
+
+def spilled(path):
+    with open(path) as f:
+        return [json_util.loads(line)['insert']['_id'] for line in f]
+
+def test_unexpected_errors_spill_instead_of_dropping(collection, tmp_path):
+    collection.error = TypeError('cannot encode object')
+    buffer = WriteBehindBuffer(spill_path=str(tmp_path / 'spill.jsonl'))
+    queue(buffer, 1, 2)
+
+    assert buffer.flush() == 0
+    assert spilled(buffer._spill_file()) == [1, 2]
+    assert not buffer.stats()['healthy']
+
+def test_failed_flush_requeues_pending_writes(collection, tmp_path):
+    buffer = WriteBehindBuffer(spill_path=str(tmp_path / 'spill.jsonl'))
+    (tmp_path / 'spill.jsonl').write_text('not json\n')
+    queue(buffer, 1)
+
+    with pytest.raises(ValueError):
+        buffer.flush()
+    assert buffer.stats()['pending'] == 1
+
+def test_only_replays_of_dead_processes_are_claimed(collection, tmp_path):
+    buffer = WriteBehindBuffer(spill_path=str(tmp_path / 'spill.jsonl'))
+    dead = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                          capture_output=True, text=True).stdout.strip()
+    live = os.getppid()
+    for pid, value in [(dead, 'dead'), (live, 'live')]:
+        (tmp_path / f'spill.jsonl.{pid}-1.replay').write_text(json_util.dumps({'c': 'logs', 'insert': {'_id': value}}) + '\n')
+
+    assert buffer.flush() == 1
+    assert [r._doc['_id'] for r in collection.requests] == ['dead']
+    assert os.path.exists(tmp_path / f'spill.jsonl.{live}-1.replay')
+
+def test_spill_files_of_live_workers_are_left_alone(collection, tmp_path):
+    buffer = WriteBehindBuffer(spill_path=str(tmp_path / 'spill.jsonl'))
+    live = tmp_path / f'spill.jsonl.{os.getppid()}'
+    live.write_text(json_util.dumps({'c': 'logs', 'insert': {'_id': 'live'}}) + '\n')
+    collection.error = TypeError('cannot encode object')
+    queue(buffer, 'own')
+    buffer.flush()
+    collection.error = None
+
+    assert buffer.flush() == 1
+    assert [r._doc['_id'] for r in collection.requests] == ['own']
+    assert spilled(live) == ['live']